@@ -2,12 +2,58 @@
 from __future__ import annotations
 
 import argparse
+import io
 import logging
+import signal
+import sys
 from pathlib import Path
+from typing import TextIO
 
 from .actions import ActionRegistry
 from .config import ConfigError, load_config
-from .monitor import DirectoryMonitor
+from .monitor import create_monitor
+
+
+_LOG_BUFFER_SIZE = 64 * 1024
+
+
+class _BufferedStreamHandler(logging.StreamHandler):
+    """Stream handler that lets log lines accumulate in the stream's buffer.
+
+    ``logging.StreamHandler`` flushes after every record, which is one write syscall
+    per line during an event storm. This handler only flushes records at
+    ``flush_level`` or above; everything else reaches the OS in large chunks when the
+    buffer fills or when the monitor flushes handlers at the end of each cycle.
+    """
+
+    def __init__(self, stream: TextIO, *, flush_level: int = logging.ERROR):
+        super().__init__(stream)
+        self.flush_level = flush_level
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+            if record.levelno >= self.flush_level:
+                self.flush()
+        except RecursionError:  # pragma: no cover - mirrors logging.StreamHandler
+            raise
+        except Exception:  # pragma: no cover - protective logging
+            self.handleError(record)
+
+
+def _buffered_stderr() -> TextIO:
+    """Return a text stream over the stderr descriptor with a 64 KiB write buffer."""
+
+    try:
+        fileno = sys.stderr.fileno()
+    except (AttributeError, OSError, ValueError):  # pragma: no cover - e.g. redirected stderr
+        return sys.stderr
+    raw = io.FileIO(fileno, "w", closefd=False)
+    return io.TextIOWrapper(
+        io.BufferedWriter(raw, buffer_size=_LOG_BUFFER_SIZE),
+        encoding=sys.stderr.encoding,
+        errors="backslashreplace",
+    )
 
 
 def main() -> None:
@@ -24,9 +70,11 @@ def main() -> None:
     )
     args = parser.parse_args()
 
+    handler = _BufferedStreamHandler(_buffered_stderr())
+    handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(name)s - %(message)s"))
     logging.basicConfig(
         level=getattr(logging, args.log_level.upper(), logging.INFO),
-        format="%(asctime)s [%(levelname)s] %(name)s - %(message)s",
+        handlers=[handler],
     )
 
     config_path = Path(args.config)
@@ -37,8 +85,14 @@ def main() -> None:
         raise SystemExit(2) from exc
 
     registry = ActionRegistry(app_config.actions)
-    monitor = DirectoryMonitor(app_config.monitor, registry)
-    monitor.run()
+    monitor = create_monitor(app_config.monitor, registry)
+    # Stop cleanly on SIGTERM so buffered log lines are written instead of lost.
+    signal.signal(signal.SIGTERM, lambda _signum, _frame: monitor.stop())
+    try:
+        monitor.run()
+    finally:
+        # Write out buffered records before a crash traceback is printed.
+        handler.flush()
 
 
 if __name__ == "__main__":
@@ -2,32 +2,98 @@
 from __future__ import annotations
 
 import calendar
+import collections
+import functools
+import heapq
 import importlib
+import itertools
 import logging
-from dataclasses import dataclass, field
+import sys
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timedelta
 from pathlib import Path
-from types import ModuleType
-from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, cast
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple, cast
 
 from .config import ActionConfig, ActionTriggerConfig, TriggerType
-from .events import EventType, FileEvent
+from .events import DATACLASS_SLOTS, EventType, FileEvent
+from .snapshot import Snapshot
 
 logger = logging.getLogger(__name__)
 
-Snapshot = Dict[Path, Tuple[float, int]]
-
 
 ActionCallback = Callable[["ActionContext", Dict[str, Any]], None]
 
-@dataclass(frozen=True)
+_LEVEL_CACHE: Dict[str, int] = {}
+
+if sys.version_info >= (3, 11):
+    _LEVELS: Dict[str, int] = logging.getLevelNamesMapping()
+else:
+    _LEVELS = {
+        name: getattr(logging, name)
+        for name in ("CRITICAL", "FATAL", "ERROR", "WARN", "WARNING", "INFO", "DEBUG", "NOTSET")
+    }
+
+
+def resolve_log_level(options: Dict[str, Any]) -> int:
+    """Return the logging level named by ``options["level"]`` (default INFO).
+
+    Callbacks use this to honour their ``level`` option. Each distinct name is resolved
+    once and cached, so callbacks that fire per event pay a single dict lookup.
+    Unknown names fall back to INFO.
+    """
+
+    raw_level = str(options.get("level", "INFO"))
+    level = _LEVEL_CACHE.get(raw_level)
+    if level is None:
+        level = _LEVEL_CACHE[raw_level] = _LEVELS.get(raw_level.upper(), logging.INFO)
+    return level
+
+
+def flush_log_handlers() -> None:
+    """Push out log records that buffered handlers on the root logger are holding.
+
+    The monitor calls this at the end of every cycle. Callbacks that hand the terminal
+    to another writer, such as a child process, call it first so earlier log lines
+    are not printed after that writer's output.
+    """
+
+    for handler in logging.getLogger().handlers:
+        handler.flush()
+
+
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class ActionContext:
-    """Context passed to action callbacks."""
+    """Context passed to action callbacks.
+
+    For scheduled runs ``modified_events`` is the net change per path since the action
+    last ran: a file created and then modified is reported once as CREATED, a file
+    created and deleted again is not reported, and a file deleted and re-created is
+    MODIFIED.
+
+    ``created_events`` is always a list: the CREATED subset of the context's events (the
+    triggering event, or ``modified_events`` for scheduled runs). The registry passes
+    it in; when it is left out, it is derived on construction.
+    """
 
     root_path: Path
     snapshot: Snapshot
     event: Optional[FileEvent] = None
     modified_events: List[FileEvent] = field(default_factory=list)
+    # None only as the "derive it" default; __post_init__ replaces it with a list.
+    created_events: List[FileEvent] = field(default=None)  # type: ignore[assignment]
+
+    def __post_init__(self) -> None:
+        if self.created_events is None:
+            events = [self.event] if self.event is not None else self.modified_events
+            object.__setattr__(self, "created_events", _created_only(events))
+
+
+@dataclass
+class _ChangeSegment:
+    """Net per-path changes from consecutive monitor cycles, up to snapshot ``generation``."""
+
+    generation: int
+    changes: Dict[Path, FileEvent] = field(default_factory=dict)
 
 
 @dataclass
@@ -39,7 +105,7 @@ class Action:
     options: Dict[str, Any]
     trigger: ActionTriggerConfig
     next_run_at: Optional[datetime] = None
-    previous_snapshot: Optional[Snapshot] = None
+    last_seen_generation: int = 0  # Newest snapshot generation whose changes this action received
 
     def is_event_trigger(self) -> bool:
         return self.trigger.type is TriggerType.EVENT
@@ -59,10 +125,18 @@ class ActionRegistry:
         self._actions: List[Action] = [self._load_action(cfg) for cfg in actions]
         self._event_actions: List[Action] = [action for action in self._actions if action.is_event_trigger()]
         self._scheduled_actions: List[Action] = [action for action in self._actions if not action.is_event_trigger()]
+        # Min-heap of (next_run_at, tiebreaker, action); the counter keeps same-time actions FIFO.
+        self._schedule_heap: List[Tuple[datetime, int, Action]] = []
+        self._schedule_counter = itertools.count()
+        # Change log of coalesced segments, oldest first. Cycles are merged into the newest segment
+        # until some action's last_seen_generation reaches it, so each segment holds at most one
+        # event per path; segments every action has seen are dropped.
+        self._change_log: Deque[_ChangeSegment] = collections.deque()
 
         now = reference_time or datetime.now()
         for action in self._scheduled_actions:
             action.schedule_next_run(now)
+            self._push_schedule(action)
 
     def __iter__(self):
         return iter(self._actions)
@@ -70,42 +144,114 @@ class ActionRegistry:
     def dispatch_event(self, event: FileEvent, *, root_path: Path, snapshot: Snapshot) -> None:
         if not self._event_actions:
             return
-        context = ActionContext(root_path=root_path, snapshot=snapshot, event=event)
+        context = ActionContext(
+            root_path=root_path,
+            snapshot=snapshot,
+            event=event,
+            created_events=[event] if event.event_type is EventType.CREATED else [],
+        )
         for action in self._event_actions:
             self._safe_invoke(action, context, event_hint=event)
 
-    def dispatch_scheduled(self, *, now: datetime, root_path: Path, snapshot: Snapshot) -> None:
-        if not self._scheduled_actions:
-            return
-        for action in self._scheduled_actions:
-            if action.next_run_at is None:
-                action.schedule_next_run(now)
-            if action.next_run_at is None or now < action.next_run_at:
-                continue
-            modified_events: List[FileEvent] = []
-            if action.previous_snapshot is not None:
-                modified_events = _diff_snapshots(action.previous_snapshot, snapshot)
+    def dispatch_scheduled(
+        self,
+        *,
+        now: datetime,
+        root_path: Path,
+        snapshot: Snapshot,
+        cycle_events: Optional[List[FileEvent]] = None,
+    ) -> None:
+        """Log this cycle's events, then run every scheduled action that is due.
+
+        ``cycle_events`` are the events the monitor emitted while producing ``snapshot``.
+        The monitor diffs once per cycle and every scheduled action reads its
+        ``modified_events`` from that one stream via the change log, coalesced to the net
+        change per path since the action last ran.
+        """
+
+        if cycle_events and self._scheduled_actions:
+            self._log_changes(snapshot.generation, cycle_events)
+
+        heap = self._schedule_heap
+        fired = False
+        while heap and heap[0][0] <= now:
+            _, _, action = heapq.heappop(heap)
+            fired = True
+            modified_events = self._events_since(action.last_seen_generation)
             context = ActionContext(
                 root_path=root_path,
                 snapshot=snapshot,
                 modified_events=modified_events,
+                created_events=_created_only(modified_events),
             )
             self._safe_invoke(action, context, event_hint=None)
-            action.previous_snapshot = dict(snapshot)
+            action.last_seen_generation = snapshot.generation
             # Schedule the next run one second after the current reference to avoid repeated triggering
             action.schedule_next_run(now + timedelta(seconds=1))
-
-    def prime_scheduled_snapshots(self, snapshot: Snapshot) -> None:
-        """Seed scheduled actions with an initial snapshot baseline."""
-
-        for action in self._scheduled_actions:
-            if action.previous_snapshot is None:
-                action.previous_snapshot = dict(snapshot)
+            self._push_schedule(action)
+        if fired:
+            self._trim_change_log()
+
+    def _log_changes(self, generation: int, events: List[FileEvent]) -> None:
+        """Fold one cycle's events into the change log.
+
+        The events join the newest segment unless some action has already received that
+        segment (its cursor is at or past the segment's generation); then a new segment
+        starts, so no action is handed changes it has seen. Memory therefore grows with
+        the number of distinct changed paths, not with the number of cycles.
+        """
+
+        log = self._change_log
+        newest_cursor = max(action.last_seen_generation for action in self._scheduled_actions)
+        if log and newest_cursor < log[-1].generation:
+            segment = log[-1]
+            segment.generation = generation
+        else:
+            segment = _ChangeSegment(generation=generation)
+            log.append(segment)
+        _coalesce_events(segment.changes, events)
+
+    def _events_since(self, generation: int) -> List[FileEvent]:
+        """Return the net change per path after snapshot ``generation``, oldest first.
+
+        The log is walked from its newest end, so an action that ran recently only
+        touches the few segments it has not seen yet.
+        """
+
+        newer: List[_ChangeSegment] = []
+        for segment in reversed(self._change_log):
+            if segment.generation <= generation:
+                break
+            newer.append(segment)
+        if not newer:
+            return []
+        if len(newer) == 1:
+            return list(newer[0].changes.values())
+        merged: Dict[Path, FileEvent] = {}
+        for segment in reversed(newer):
+            _coalesce_events(merged, segment.changes.values())
+        return list(merged.values())
+
+    def _trim_change_log(self) -> None:
+        """Drop change-log segments that every scheduled action has already received."""
+
+        oldest_cursor = min(action.last_seen_generation for action in self._scheduled_actions)
+        log = self._change_log
+        while log and log[0].generation <= oldest_cursor:
+            log.popleft()
+
+    def _push_schedule(self, action: Action) -> None:
+        """Queue a scheduled action at its ``next_run_at``; actions with no next run are dropped."""
+
+        if action.next_run_at is None:
+            return
+        heapq.heappush(self._schedule_heap, (action.next_run_at, next(self._schedule_counter), action))
 
     def _load_action(self, config: ActionConfig) -> Action:
-        module = _import_module(config.module)
         try:
-            callback = getattr(module, config.function)
+            callback = _cached_lookup(config.module, config.function)
+        except ImportError as exc:  # pragma: no cover - defensive logging
+            raise RuntimeError(f"Unable to import action module '{config.module}'") from exc
         except AttributeError as exc:
             raise RuntimeError(
                 f"Action '{config.name}' could not find function '{config.function}' in {config.module}"
@@ -130,49 +276,70 @@ class ActionRegistry:
                 logger.exception("Action %s failed for event %s", action.name, event_hint)
 
 
-def _diff_snapshots(old: Snapshot, new: Snapshot) -> List[FileEvent]:
-    events: List[FileEvent] = []
-    seen: Set[Path] = set()
-
-    for path, (mtime, size) in new.items():
-        old_values = old.get(path)
-        if old_values is None:
-            events.append(FileEvent(event_type=EventType.CREATED, path=path, size=size, mtime=mtime))
+def _coalesce_events(changes: Dict[Path, FileEvent], events: Iterable[FileEvent]) -> None:
+    """Fold ``events`` into ``changes`` so it keeps one net event per path.
+
+    The net type depends on whether the path existed before the first change and exists
+    after the last one: CREATED then MODIFIED stays CREATED (with the newest metadata),
+    CREATED then DELETED drops the path, DELETED then CREATED becomes MODIFIED, and
+    MODIFIED then DELETED becomes DELETED. MOVED events replace whatever was recorded.
+    """
+
+    for event in events:
+        path = event.path
+        previous = changes.get(path)
+        if previous is None or EventType.MOVED in (previous.event_type, event.event_type):
+            changes[path] = event
+            continue
+        existed_before = previous.event_type is not EventType.CREATED
+        exists_now = event.event_type is not EventType.DELETED
+        if not existed_before and not exists_now:
+            del changes[path]
+            continue
+        if not existed_before:
+            net_type = EventType.CREATED
+        elif exists_now:
+            net_type = EventType.MODIFIED
         else:
-            old_mtime, old_size = old_values
-            if old_mtime != mtime or old_size != size:
-                events.append(FileEvent(event_type=EventType.MODIFIED, path=path, size=size, mtime=mtime))
-        seen.add(path)
+            net_type = EventType.DELETED
+        changes[path] = event if event.event_type is net_type else replace(event, event_type=net_type)
 
-    for path, (mtime, size) in old.items():
-        if path not in seen:
-            events.append(FileEvent(event_type=EventType.DELETED, path=path, size=size, mtime=mtime))
 
-    return events
+def _created_only(events: Iterable[FileEvent]) -> List[FileEvent]:
+    created = EventType.CREATED
+    return [event for event in events if event.event_type is created]
 
 
-def _import_module(module_path: str) -> ModuleType:
-    try:
-        return importlib.import_module(module_path)
-    except ImportError as exc:  # pragma: no cover - defensive logging
-        raise RuntimeError(f"Unable to import action module '{module_path}'") from exc
+@functools.lru_cache(maxsize=None)
+def _cached_lookup(module_path: str, attr: str) -> Any:
+    """Return ``module_path.attr``, importing the module only if it is not loaded yet.
+
+    Results are memoized so rebuilding a registry from the same configuration skips
+    the import machinery entirely. Failed lookups raise and are not cached.
+    """
+
+    modules = sys.modules
+    if module_path not in modules:
+        importlib.import_module(module_path)
+    return getattr(modules[module_path], attr)
 
 
 def _compute_next_run(trigger: ActionTriggerConfig, reference: datetime) -> Optional[datetime]:
     if trigger.type is TriggerType.EVENT:
         return None
 
+    # Minutely and hourly triggers step on wall-clock fields, matching the naive local
+    # datetime.now() the scheduler compares against, so a DST fall-back never yields a
+    # next run that is earlier than the reference.
     if trigger.type is TriggerType.MINUTELY:
-        second = trigger.time.second if trigger.time is not None else 0
-        base = reference.replace(second=second, microsecond=0)
+        base = reference.replace(second=trigger.second, microsecond=0)
         if base <= reference:
             base += timedelta(minutes=1)
         return base
-    
+
     if trigger.type is TriggerType.HOURLY:
         minute = trigger.minute if trigger.minute is not None else 0
-        second = trigger.time.second if trigger.time is not None else 0
-        base = reference.replace(minute=minute, second=second, microsecond=0)
+        base = reference.replace(minute=minute, second=trigger.second, microsecond=0)
         if base <= reference:
             base += timedelta(hours=1)
         return base
@@ -221,6 +388,7 @@ def _compute_next_run(trigger: ActionTriggerConfig, reference: datetime) -> Opti
 _DEFAULT_TIME = datetime.min.time().replace(hour=0, minute=0, second=0, microsecond=0)
 
 
+@functools.lru_cache(maxsize=256)
 def _clamped_month_datetime(year: int, month: int, day: int, time_of_day) -> datetime:
     last_day = calendar.monthrange(year, month)[1]
     target_day = min(day, last_day)
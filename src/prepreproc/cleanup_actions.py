@@ -2,11 +2,12 @@
 from __future__ import annotations
 
 import logging
+import os
 import time
-from pathlib import Path
+from collections import Counter
 from typing import Any, Dict
 
-from .actions import ActionContext
+from .actions import ActionContext, resolve_log_level
 
 logger = logging.getLogger(__name__)
 
@@ -14,8 +15,7 @@ logger = logging.getLogger(__name__)
 def list_old_files(context: ActionContext, options: Dict[str, Any]) -> None:
     """Report how many files exist in each directory that are older than the configured threshold_days days old."""
 
-    level_name = str(options.get("level", "INFO")).upper()
-    level = getattr(logging, level_name, logging.INFO)
+    level = resolve_log_level(options)
 
     threshold_option = options.get("threshold_days")
     if threshold_option is None:
@@ -32,17 +32,30 @@ def list_old_files(context: ActionContext, options: Dict[str, Any]) -> None:
         logger.error("list_old_files received negative 'threshold_days': %s", threshold_days)
         return
 
+    if not logger.isEnabledFor(level):
+        return
+
     threshold_display = int(threshold_days) if float(threshold_days).is_integer() else threshold_days
     cutoff_epoch = time.time() - (threshold_days * 86400)
 
-    counts: Dict[str, int] = {}
-    total_old = 0
-    for path, (mtime, _size) in context.snapshot.items():
+    # Snapshot keys are path strings, so directories are split off with string slicing
+    # rather than building a Path and calling relative_to() for every file.
+    root_prefix = os.path.join(str(context.root_path), "")
+    prefix_length = len(root_prefix)
+    separator = os.sep
+    dirname = os.path.dirname
+    counts: Counter = Counter()
+    # One linear pass: snapshots are rebuilt every cycle, so an mtime-sorted index
+    # would cost a fresh sort on each run, which is slower than this filter.
+    for path, mtime, _size in context.snapshot.entries():
         if mtime > cutoff_epoch:
             continue
-        directory_key = _relative_directory(path.parent, context.root_path)
-        counts[directory_key] = counts.get(directory_key, 0) + 1
-        total_old += 1
+        if path.startswith(root_prefix):
+            directory_key = path[prefix_length:].rpartition(separator)[0] or "."
+        else:
+            directory_key = dirname(path)
+        counts[directory_key] += 1
+    total_old = sum(counts.values())
 
     if not counts:
         logger.log(
@@ -54,7 +67,7 @@ def list_old_files(context: ActionContext, options: Dict[str, Any]) -> None:
         return
 
     summary_items = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
-    summary = ", ".join(f"{directory}: {count}" for directory, count in summary_items)
+    summary = ", ".join([f"{directory}: {count}" for directory, count in summary_items])
 
     logger.log(
         level,
@@ -65,12 +78,3 @@ def list_old_files(context: ActionContext, options: Dict[str, Any]) -> None:
         summary,
     )
 
-
-def _relative_directory(directory: Path, root_path: Path) -> str:
-    try:
-        relative = directory.relative_to(root_path)
-    except ValueError:
-        return str(directory)
-
-    relative_str = str(relative)
-    return relative_str if relative_str else "."
@@ -10,6 +10,10 @@ from typing import Any, Dict, List, Optional
 
 import yaml # type: ignore
 
+try:  # Prefer the libyaml-backed parser when PyYAML was built with it
+    from yaml import CSafeLoader as _YamlLoader  # type: ignore
+except ImportError:  # pragma: no cover - depends on the PyYAML build
+    from yaml import SafeLoader as _YamlLoader  # type: ignore
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +33,14 @@ class TriggerType(str, Enum):
     MONTHLY = "monthly"
 
 
+class MonitorBackend(str, Enum):
+    """Filesystem change detection strategies supported by the monitor."""
+
+    AUTO = "auto"
+    POLLING = "polling"
+    INOTIFY = "inotify"
+
+
 @dataclass
 class MonitorConfig:
     """Options describing how the filesystem monitor should behave."""
@@ -38,6 +50,7 @@ class MonitorConfig:
     recursive: bool = True
     include_patterns: List[str] = field(default_factory=list)
     exclude_patterns: List[str] = field(default_factory=list)
+    backend: MonitorBackend = MonitorBackend.AUTO
 
 
 @dataclass
@@ -49,6 +62,10 @@ class ActionTriggerConfig:
     weekday: Optional[int] = None  # Monday=0, Sunday=6
     day: Optional[int] = None  # 1-31
     minute: Optional[int] = None  # 0-59 for hourly triggers
+    second: int = field(init=False, default=0)  # Derived from time; used by minutely/hourly triggers
+
+    def __post_init__(self) -> None:
+        self.second = self.time.second if self.time is not None else 0
 
 
 @dataclass
@@ -77,7 +94,7 @@ def load_config(path: Path) -> AppConfig:
         raise ConfigError(f"Configuration file not found: {path}")
 
     try:
-        data = yaml.safe_load(path.read_text())
+        data = yaml.load(path.read_bytes(), Loader=_YamlLoader)
     except yaml.YAMLError as exc:  # pragma: no cover - logging helper
         raise ConfigError(f"Failed to parse YAML configuration: {exc}") from exc
 
@@ -117,12 +134,20 @@ def _parse_monitor_config(raw: Any, *, config_path: Path) -> MonitorConfig:
     include_patterns = _ensure_str_list(raw.get("include_patterns", []), "monitor.include_patterns")
     exclude_patterns = _ensure_str_list(raw.get("exclude_patterns", []), "monitor.exclude_patterns")
 
+    backend_raw = raw.get("backend", MonitorBackend.AUTO.value)
+    try:
+        backend = MonitorBackend(backend_raw)
+    except ValueError as exc:
+        allowed = ", ".join(option.value for option in MonitorBackend)
+        raise ConfigError(f"monitor.backend must be one of: {allowed}") from exc
+
     return MonitorConfig(
         root_path=root_path,
         poll_interval=poll_interval_val,
         recursive=recursive_flag,
         include_patterns=include_patterns,
         exclude_patterns=exclude_patterns,
+        backend=backend,
     )
 
 
@@ -1,10 +1,15 @@
 """Event models shared across monitor components."""
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional
+
+# ``slots=True`` drops the per-instance __dict__ of bulk-created dataclasses but needs
+# Python 3.10+; older interpreters get regular dataclasses.
+DATACLASS_SLOTS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
 
 
 class EventType(str, Enum):
@@ -16,7 +21,7 @@ class EventType(str, Enum):
     MOVED = "moved"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class FileEvent:
     """A single change observed in the watched directory tree."""
 
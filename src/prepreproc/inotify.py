@@ -0,0 +1,131 @@
+"""Minimal ctypes bindings for the Linux inotify API."""
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import struct
+import sys
+from dataclasses import dataclass
+from typing import Any, List, Optional
+
+# Event masks from <sys/inotify.h>.
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0)
+
+WATCH_MASK = (
+    IN_CREATE
+    | IN_MODIFY
+    | IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_DELETE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+    | IN_ONLYDIR
+)
+
+_EVENT_HEADER = struct.Struct("iIII")
+_READ_SIZE = 64 * 1024
+
+
+@dataclass(frozen=True)
+class InotifyEvent:
+    """A single raw event read from the inotify file descriptor."""
+
+    wd: int
+    mask: int
+    cookie: int
+    name: str
+
+
+def _load_libc() -> Optional[Any]:
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    except OSError:
+        return None
+    if not hasattr(libc, "inotify_init1") or not hasattr(libc, "inotify_add_watch"):
+        return None
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+    return libc
+
+
+_LIBC = _load_libc()
+
+
+def inotify_available() -> bool:
+    """Return True when the running platform exposes the inotify API."""
+
+    return _LIBC is not None
+
+
+class Inotify:
+    """Owns an inotify file descriptor and decodes the events read from it."""
+
+    def __init__(self) -> None:
+        if _LIBC is None:
+            raise OSError("inotify is not available on this platform")
+        fd = _LIBC.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self._fd = fd
+
+    def add_watch(self, path: str, mask: int = WATCH_MASK) -> int:
+        """Watch a directory and return the watch descriptor; raises OSError on failure."""
+
+        wd = _LIBC.inotify_add_watch(self._fd, os.fsencode(path), mask)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), path)
+        return wd
+
+    def remove_watch(self, wd: int) -> None:
+        """Stop watching the given descriptor, ignoring descriptors the kernel already dropped."""
+
+        _LIBC.inotify_rm_watch(self._fd, wd)
+
+    def read_events(self) -> List[InotifyEvent]:
+        """Drain every queued event without blocking."""
+
+        events: List[InotifyEvent] = []
+        while True:
+            try:
+                buffer = os.read(self._fd, _READ_SIZE)
+            except BlockingIOError:
+                break
+            if not buffer:
+                break
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(buffer):
+                wd, mask, cookie, name_len = _EVENT_HEADER.unpack_from(buffer, offset)
+                offset += _EVENT_HEADER.size
+                raw_name = buffer[offset : offset + name_len].rstrip(b"\0")
+                offset += name_len
+                events.append(InotifyEvent(wd=wd, mask=mask, cookie=cookie, name=os.fsdecode(raw_name)))
+        return events
+
+    def close(self) -> None:
+        """Release the inotify file descriptor and every watch attached to it."""
+
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
@@ -1,22 +1,38 @@
-"""Filesystem monitoring loop with a simple polling backend."""
+"""Filesystem monitoring loop with polling and inotify backends."""
 from __future__ import annotations
 
+import fnmatch
 import logging
+import os
+import re
+import stat as stat_module
 import threading
 import time
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Iterable, List, Set, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Pattern, Set, Tuple
 
-from .actions import ActionRegistry
-from .config import MonitorConfig
+from .actions import ActionRegistry, flush_log_handlers
+from .config import MonitorBackend, MonitorConfig
 from .events import EventType, FileEvent
+from .inotify import (
+    IN_CREATE,
+    IN_DELETE,
+    IN_DELETE_SELF,
+    IN_IGNORED,
+    IN_ISDIR,
+    IN_MOVED_FROM,
+    IN_MOVED_TO,
+    IN_MOVE_SELF,
+    IN_Q_OVERFLOW,
+    Inotify,
+    inotify_available,
+)
+from .snapshot import Snapshot, diff_snapshots
 
 logger = logging.getLogger(__name__)
 
-Snapshot = Dict[Path, Tuple[float, int]]
-
 
 @dataclass
 class MonitorStats:
@@ -33,8 +49,10 @@ class DirectoryMonitor:
         self._config = config
         self._actions = actions
         self._stop_event = threading.Event()
-        self._snapshot: Snapshot = {}
+        self._snapshot = Snapshot()
         self._stats = MonitorStats()
+        self._include_re = _compile_patterns(config.include_patterns)
+        self._exclude_re = _compile_patterns(config.exclude_patterns)
 
     def run(self) -> None:
         """Run the monitoring loop until stopped."""
@@ -42,9 +60,8 @@ class DirectoryMonitor:
         logger.info("Starting monitor for %s", self._config.root_path)
         try:
             self._snapshot = self._scan()
-            self._actions.prime_scheduled_snapshots(self._snapshot)
             while not self._stop_event.is_set():
-                start_time = time.time()
+                start_time = time.monotonic()
                 events, new_snapshot = self._detect_changes()
                 for event in events:
                     self._actions.dispatch_event(
@@ -57,10 +74,12 @@ class DirectoryMonitor:
                     now=datetime.now(),
                     root_path=self._config.root_path,
                     snapshot=new_snapshot,
+                    cycle_events=events,
                 )
                 self._snapshot = new_snapshot
                 self._stats.cycles += 1
                 self._stats.events_emitted += len(events)
+                flush_log_handlers()
                 self._sleep_until_next_cycle(start_time)
         except KeyboardInterrupt:
             logger.info("Monitor interrupted by user")
@@ -77,70 +96,374 @@ class DirectoryMonitor:
         self._stop_event.set()
 
     def _sleep_until_next_cycle(self, started_at: float) -> None:
-        elapsed = time.time() - started_at
+        # Waiting on the stop event lets stop() cut the sleep short; the monotonic clock
+        # keeps wall-clock adjustments from stretching or skipping a cycle.
+        elapsed = time.monotonic() - started_at
         remaining = max(self._config.poll_interval - elapsed, 0.0)
         if remaining > 0:
-            time.sleep(remaining)
+            self._stop_event.wait(remaining)
 
     def _detect_changes(self) -> Tuple[List[FileEvent], Snapshot]:
         new_snapshot = self._scan()
-        events = list(_diff_snapshots(self._snapshot, new_snapshot))
+        events = list(diff_snapshots(self._snapshot, new_snapshot))
         return events, new_snapshot
 
     def _scan(self) -> Snapshot:
         root = self._config.root_path
         if not root.exists():
             logger.warning("Root path %s does not exist yet; skipping scan", root)
-            return {}
-        results: Snapshot = {}
-        paths = _iter_paths(root, recursive=self._config.recursive)
-        for path in paths:
-            if not path.is_file():
+            return Snapshot(generation=self._snapshot.generation + 1)
+        results = Snapshot(generation=self._snapshot.generation + 1)
+        for directory, entries in _walk_scandir(str(root), recursive=self._config.recursive):
+            results.add_directory(directory, self._tracked_files(entries))
+        return results
+
+    def _tracked_files(
+        self, entries: List[Tuple[str, os.DirEntry]]
+    ) -> Iterator[Tuple[str, str, float, int]]:
+        """Yield ``(path, name, mtime, size)`` for the listed files that should be tracked.
+
+        Values are streamed straight into the new snapshot's arrays, so no per-directory
+        list is built and nothing per file outlives the scan except the path string.
+        Paths already tracked reuse the previous snapshot's string objects, so consecutive
+        snapshots share keys (dict probes and list compares hit the identity fast path) and
+        the freshly listed copies are freed at once. A tracked path also passed the
+        include/exclude patterns last cycle, so only new paths are matched.
+        """
+
+        previous_index = self._snapshot.index
+        previous_paths = self._snapshot.paths
+        for path, entry in entries:
+            previous_position = previous_index.get(path)
+            if previous_position is not None:
+                path = previous_paths[previous_position]
+            elif not self._matches_patterns(path):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            yield path, entry.name, stat.st_mtime, stat.st_size
+
+    def _matches_patterns(self, path: str) -> bool:
+        """Apply the include/exclude globs to a file's name and to its full path."""
+
+        path = os.path.normcase(path)
+        name = os.path.basename(path)
+        exclude_re = self._exclude_re
+        if exclude_re is not None and (exclude_re.match(name) or exclude_re.match(path)):
+            return False
+        include_re = self._include_re
+        return include_re is None or bool(include_re.match(name) or include_re.match(path))
+
+
+class InotifyMonitor(DirectoryMonitor):
+    """Applies kernel-reported inotify changes instead of rescanning the whole tree.
+
+    The tree is scanned once at startup to seed the snapshot. After that each cycle
+    drains the inotify queue and stats only the paths the kernel reported, so an idle
+    tree costs no filesystem syscalls. Scheduled actions still run on the poll timer.
+
+    Whenever part of the tree is not covered by a watch (the root is missing or was
+    renamed away, a directory could not be watched, or the kernel queue overflowed),
+    cycles fall back to full polling scans and retry the failed watches; incremental
+    updates resume once every directory is watched again. If no inotify instance can be
+    created at all, the monitor behaves exactly like ``DirectoryMonitor``.
+    """
+
+    def __init__(self, config: MonitorConfig, actions: ActionRegistry):
+        super().__init__(config, actions)
+        self._inotify: Optional[Inotify] = None
+        self._watches: Dict[int, str] = {}
+        self._root_wd: Optional[int] = None
+        self._unwatched: Set[str] = set()  # Existing directories whose watch failed
+
+    def run(self) -> None:
+        """Install watches on the tree, then run the monitoring loop until stopped.
+
+        Falls back to plain polling when the inotify instance cannot be created, for
+        example once the per-user ``max_user_instances`` limit is exhausted.
+        """
+
+        try:
+            self._inotify = Inotify()
+        except OSError as exc:
+            logger.warning("Unable to start inotify (%s); falling back to polling", exc)
+            super().run()
+            return
+        try:
+            # Watches go in before the seed scan so no change slips between the two.
+            self._watch_tree(str(self._config.root_path))
+            super().run()
+        finally:
+            self._inotify.close()
+            self._inotify = None
+            self._watches.clear()
+            self._root_wd = None
+            self._unwatched.clear()
+
+    def _detect_changes(self) -> Tuple[List[FileEvent], Snapshot]:
+        if self._inotify is None:
+            # inotify could not be started; run() is polling instead.
+            return super()._detect_changes()
+        if not self._watches:
+            # The root is missing (or was removed); poll until it exists, then watch it.
+            self._watch_tree(str(self._config.root_path))
+            return super()._detect_changes()
+
+        candidates = self._read_candidates()
+        if not self._watches:
+            # The root was renamed or removed while this cycle's events were read.
+            self._watch_tree(str(self._config.root_path))
+            return super()._detect_changes()
+        if candidates is None:
+            logger.warning("inotify queue overflowed; rescanning %s", self._config.root_path)
+            self._watch_tree(str(self._config.root_path))
+            return super()._detect_changes()
+        if self._unwatched:
+            # Changes under an unwatched directory are invisible to the kernel queue, so
+            # scan the whole tree. The scan runs after the retry, so a watch that
+            # succeeds now cannot miss anything before incremental updates resume.
+            for directory in sorted(self._unwatched):
+                self._watch_tree(directory)
+            if not self._unwatched:
+                logger.info("All directories under %s are watched again", self._config.root_path)
+            return super()._detect_changes()
+
+        if not candidates:
+            return [], self._snapshot
+        return self._apply_candidates(candidates)
+
+    def _read_candidates(self) -> Optional[Set[str]]:
+        """Drain the inotify queue and return the file paths it reported as changed.
+
+        Watches are added and dropped as directories come and go. When the root itself is
+        renamed or removed every watch is dropped, since the remaining ones follow the old
+        tree; ``_watches`` is then empty and the caller rescans and re-watches the root.
+        Returns None when the kernel queue overflowed, meaning some events were lost.
+        """
+
+        assert self._inotify is not None
+        candidates: Set[str] = set()
+        for raw in self._inotify.read_events():
+            if raw.mask & IN_Q_OVERFLOW:
+                return None
+            if raw.wd == self._root_wd and raw.mask & (IN_MOVE_SELF | IN_DELETE_SELF | IN_IGNORED):
+                self._remove_all_watches()
+                continue
+            if raw.mask & IN_IGNORED:
+                self._watches.pop(raw.wd, None)
                 continue
-            if not _matches_patterns(path, self._config.include_patterns, self._config.exclude_patterns):
+            directory = self._watches.get(raw.wd)
+            if directory is None or not raw.name:
                 continue
+            path = os.path.join(directory, raw.name)
+            if raw.mask & IN_ISDIR:
+                candidates.update(self._handle_directory_event(path, raw.mask))
+            else:
+                candidates.add(path)
+        return candidates
+
+    def _remove_all_watches(self) -> None:
+        """Remove every watch, including the root's, and forget the unwatched directories."""
+
+        assert self._inotify is not None
+        for wd in self._watches:
+            self._inotify.remove_watch(wd)
+        self._watches.clear()
+        self._root_wd = None
+        self._unwatched.clear()
+
+    def _apply_candidates(self, candidates: Set[str]) -> Tuple[List[FileEvent], Snapshot]:
+        """Stat each candidate path and return its events plus the updated snapshot."""
+
+        new_snapshot = self._snapshot.copy()
+        new_snapshot.generation += 1
+        events: List[FileEvent] = []
+        for path in candidates:
+            previous = new_snapshot.get(path)
+            current = self._stat_candidate(path)
+            if current is None:
+                if previous is not None:
+                    new_snapshot.remove(path)
+                    events.append(
+                        FileEvent(event_type=EventType.DELETED, path=Path(path), size=previous[1], mtime=previous[0])
+                    )
+                continue
+            new_snapshot.set(path, current[0], current[1])
+            if previous is None:
+                events.append(
+                    FileEvent(event_type=EventType.CREATED, path=Path(path), size=current[1], mtime=current[0])
+                )
+            elif previous != current:
+                events.append(
+                    FileEvent(event_type=EventType.MODIFIED, path=Path(path), size=current[1], mtime=current[0])
+                )
+        return events, new_snapshot
+
+    def _handle_directory_event(self, path: str, mask: int) -> Iterable[str]:
+        """Update watches for a directory change and return the file paths it affects."""
+
+        if mask & (IN_CREATE | IN_MOVED_TO):
+            if not self._config.recursive:
+                return []
+            # Files may land in a new directory before its watch exists, so list it once.
+            self._watch_tree(path)
+            return [
+                file_path
+                for _directory, files in _walk_scandir(path, recursive=True)
+                for file_path, _entry in files
+            ]
+
+        if mask & (IN_DELETE | IN_MOVED_FROM):
+            assert self._inotify is not None
+            prefix = path + os.sep
+            for wd, watched in list(self._watches.items()):
+                if watched == path or watched.startswith(prefix):
+                    self._inotify.remove_watch(wd)
+                    del self._watches[wd]
+            self._unwatched = {
+                directory
+                for directory in self._unwatched
+                if directory != path and not directory.startswith(prefix)
+            }
+            return [known for known in self._snapshot if known.startswith(prefix)]
+
+        return []
+
+    def _watch_tree(self, root: str) -> None:
+        """Add a watch on ``root`` and, when recursive, on every directory beneath it.
+
+        Directories that exist but cannot be watched (for example with ENOSPC once
+        ``max_user_watches`` is used up) are recorded in ``_unwatched`` and skipped
+        together with their subtree; ``_detect_changes`` scans the full tree and retries
+        them until they succeed. A warning is logged the first time each one fails.
+        """
+
+        assert self._inotify is not None
+        directories = [root]
+        while directories:
+            directory = directories.pop()
             try:
-                stat = path.stat()
-            except FileNotFoundError:
+                wd = self._inotify.add_watch(directory)
+            except (FileNotFoundError, NotADirectoryError) as exc:
+                # Gone already; its parent's watch reports it if it comes back, and a
+                # missing root is reported by the scan.
+                logger.debug("Unable to watch %s: %s", directory, exc)
+                self._unwatched.discard(directory)
+                continue
+            except OSError as exc:
+                if directory not in self._unwatched:
+                    logger.warning(
+                        "Unable to watch %s (%s); scanning the full tree until it can be watched",
+                        directory,
+                        exc,
+                    )
+                    self._unwatched.add(directory)
+                continue
+            self._unwatched.discard(directory)
+            self._watches[wd] = directory
+            if directory == str(self._config.root_path):
+                self._root_wd = wd
+            if not self._config.recursive:
+                continue
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            directories.append(entry.path)
+            except OSError:
                 continue
-            results[path] = (stat.st_mtime, stat.st_size)
-        return results
 
+    def _stat_candidate(self, path: str) -> Optional[Tuple[float, int]]:
+        """Return (mtime, size) for a tracked regular file, or None if it should not be tracked."""
+
+        if not self._matches_patterns(path):
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if not stat_module.S_ISREG(stat.st_mode):
+            return None
+        return (stat.st_mtime, stat.st_size)
 
-def _iter_paths(root: Path, *, recursive: bool) -> Iterable[Path]:
-    if recursive:
-        yield from root.rglob("*")
-    else:
-        yield from root.glob("*")
 
+def create_monitor(config: MonitorConfig, actions: ActionRegistry) -> DirectoryMonitor:
+    """Build the monitor implementation selected by ``config.backend``."""
 
-def _matches_patterns(path: Path, include_patterns: List[str], exclude_patterns: List[str]) -> bool:
-    from fnmatch import fnmatch
+    if config.backend is MonitorBackend.POLLING:
+        return DirectoryMonitor(config, actions)
+    if inotify_available():
+        return InotifyMonitor(config, actions)
+    if config.backend is MonitorBackend.INOTIFY:
+        logger.warning("inotify is not available on this platform; falling back to polling")
+    return DirectoryMonitor(config, actions)
 
-    relative = path.name
-    rel_from_root = str(path)
 
-    if exclude_patterns and any(fnmatch(relative, pat) or fnmatch(rel_from_root, pat) for pat in exclude_patterns):
-        return False
+def _walk_scandir(root: str, *, recursive: bool) -> Iterator[Tuple[str, List[Tuple[str, os.DirEntry]]]]:
+    """Yield ``(directory, files)`` for every directory under ``root``.
+
+    ``files`` lists a ``(path, entry)`` pair per file. Entry types come from the
+    ``d_type`` field returned with the directory listing, so regular files need no
+    extra syscall to be classified and ``entry.stat()`` is cached on the entry.
+    Symlinked directories are not descended into; symlinked files are reported like
+    regular files. Directories that vanish mid-walk are skipped.
+
+    Where ``os.scandir`` accepts a descriptor, each directory is opened once and listed
+    through it, so the stat calls for all of its files resolve relative to that
+    descriptor instead of walking the full path again per file. The descriptor is
+    closed when the walk moves on, so stat the entries before asking for the next
+    directory.
+    """
+
+    list_by_fd = os.scandir in os.supports_fd
+    join = os.path.join
+    directories = [root]
+    while directories:
+        directory = directories.pop()
+        dir_fd: Optional[int] = None
+        try:
+            if list_by_fd:
+                dir_fd = os.open(directory, _DIRECTORY_OPEN_FLAGS)
+                scanner = os.scandir(dir_fd)
+            else:
+                scanner = os.scandir(directory)
+        except OSError:
+            if dir_fd is not None:
+                os.close(dir_fd)
+            continue
+        try:
+            files: List[Tuple[str, os.DirEntry]] = []
+            with scanner:
+                for entry in scanner:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if recursive:
+                                directories.append(join(directory, entry.name))
+                        elif entry.is_file():
+                            files.append((join(directory, entry.name), entry))
+                    except OSError:
+                        continue
+            yield directory, files
+        finally:
+            if dir_fd is not None:
+                os.close(dir_fd)
+
 
-    if not include_patterns:
-        return True
+_DIRECTORY_OPEN_FLAGS = os.O_RDONLY | getattr(os, "O_DIRECTORY", 0)
 
-    return any(fnmatch(relative, pat) or fnmatch(rel_from_root, pat) for pat in include_patterns)
 
+def _compile_patterns(patterns: List[str]) -> Optional[Pattern[str]]:
+    """Combine glob patterns into one regex, or return None when there are none.
 
-def _diff_snapshots(old: Snapshot, new: Snapshot) -> Iterable[FileEvent]:
-    seen: Set[Path] = set()
+    Matching a single alternation is equivalent to calling ``fnmatch`` once per pattern,
+    but the globs are translated and compiled only once instead of on every file.
+    """
 
-    for path, (mtime, size) in new.items():
-        if path not in old:
-            yield FileEvent(event_type=EventType.CREATED, path=path, size=size, mtime=mtime)
-        else:
-            old_mtime, old_size = old[path]
-            if old_mtime != mtime or old_size != size:
-                yield FileEvent(event_type=EventType.MODIFIED, path=path, size=size, mtime=mtime)
-        seen.add(path)
+    if not patterns:
+        return None
+    return re.compile(
+        "|".join(f"(?:{fnmatch.translate(os.path.normcase(pattern))})" for pattern in patterns)
+    )
 
-    for path, (mtime, size) in old.items():
-        if path not in seen:
-            yield FileEvent(event_type=EventType.DELETED, path=path, size=size, mtime=mtime)
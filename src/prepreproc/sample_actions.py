@@ -1,12 +1,18 @@
 """Example action callbacks that can be referenced from configuration."""
 from __future__ import annotations
 
+import functools
 import logging
+import os
+import shlex
 import subprocess
-from typing import Any, Dict
+from collections import Counter
+from pathlib import Path
+from string import Formatter
+from typing import Any, Callable, Dict, Iterable, List, Optional
 
-from .actions import ActionContext
-from .events import EventType
+from .actions import ActionContext, flush_log_handlers, resolve_log_level
+from .events import FileEvent
 
 logger = logging.getLogger(__name__)
 
@@ -14,17 +20,20 @@ logger = logging.getLogger(__name__)
 def log_event(context: ActionContext, options: Dict[str, Any]) -> None:
     """Log file-level events or scheduled scans depending on trigger type."""
 
-    level_name = str(options.get("level", "INFO")).upper()
-    level = getattr(logging, level_name, logging.INFO)
+    level = resolve_log_level(options)
+    if not logger.isEnabledFor(level):
+        return
 
-    if context.event is not None:
+    event = context.event
+    if event is not None:
         message = options.get("message", "Filesystem event detected")
-        logger.log(level, "%s: %s", message, _describe_event(context.event))
+        logger.log(level, "%s: %s", message, _describe_event(event))
         return
 
     message = options.get("schedule_message", "Scheduled directory scan")
-    total_files = len(context.snapshot)
-    total_bytes = sum(size for _, size in context.snapshot.values())
+    snapshot = context.snapshot
+    total_files = len(snapshot)
+    total_bytes = snapshot.total_bytes
     changed_count = len(context.modified_events)
     logger.log(
         level,
@@ -39,61 +48,89 @@ def log_event(context: ActionContext, options: Dict[str, Any]) -> None:
 def summarize_directory(context: ActionContext, options: Dict[str, Any]) -> None:
     """Summarize extensions within the tracked directory tree."""
 
-    level_name = str(options.get("level", "INFO")).upper()
-    level = getattr(logging, level_name, logging.INFO)
+    level = resolve_log_level(options)
+    if not logger.isEnabledFor(level):
+        return
     min_count = int(options.get("min_count", 1))
 
-    counts: Dict[str, int] = {}
-    for path in context.snapshot.keys():
-        suffix = path.suffix.lower() or "<no-ext>"
-        counts[suffix] = counts.get(suffix, 0) + 1
+    counts = _count_suffixes(context.snapshot.paths)
+    filtered = {ext: count for ext, count in counts.items() if count >= min_count} or counts
 
-    filtered = {ext: count for ext, count in counts.items() if count >= min_count}
-    if not filtered:
-        filtered = counts
-
-    sorted_items = sorted(filtered.items(), key=lambda item: item[0])
-    summary = ", ".join(f"{ext}: {count}" for ext, count in sorted_items) or "<empty>"
+    summary = ", ".join([f"{ext}: {count}" for ext, count in sorted(filtered.items())]) or "<empty>"
     logger.log(level, "Directory summary for %s -> %s", context.root_path, summary)
 
 
 def summarize_added_files(context: ActionContext, options: Dict[str, Any]) -> None:
     """Report how many new files were created in each directory since the last run."""
 
-    level_name = str(options.get("level", "INFO")).upper()
-    level = getattr(logging, level_name, logging.INFO)
-
-    events = context.modified_events
-    if context.event is not None:
-        events = [context.event]
-
-    created = [event for event in events if event.event_type is EventType.CREATED]
-    if not created:
-        logger.log(level, "No new files detected for %s", context.root_path)
+    level = resolve_log_level(options)
+    if not logger.isEnabledFor(level):
         return
 
-    counts: Dict[str, int] = {}
-    for event in created:
-        directory = _relative_directory(event.path.parent, context.root_path)
-        counts[directory] = counts.get(directory, 0) + 1
+    root = context.root_path
+    created_events = context.created_events
+    if not created_events:
+        logger.log(level, "No new files detected for %s", root)
+        return
 
-    total_new = len(created)
+    counts = _count_created_by_directory(created_events, root)
+    total_new = len(created_events)
     directory_summary = ", ".join(
-        f"{directory}: {counts[directory]}" for directory in sorted(counts)
+        [f"{directory}: {count}" for directory, count in sorted(counts.items())]
     )
     logger.log(
         level,
         "New files (%s total) for %s -> %s",
         total_new,
-        context.root_path,
+        root,
         directory_summary,
     )
 
 
+def summarize_scan(context: ActionContext, options: Dict[str, Any]) -> None:
+    """Log the file totals, extension counts, and new files per directory as one record.
+
+    This combines ``log_event``'s scheduled summary, ``summarize_directory``, and
+    ``summarize_added_files`` into a single action and log record. The summary dict is
+    also attached to the record as ``scan_summary`` for structured log handlers.
+    """
+
+    level = resolve_log_level(options)
+    if not logger.isEnabledFor(level):
+        return
+    min_count = int(options.get("min_count", 1))
+
+    snapshot = context.snapshot
+    extensions = _count_suffixes(snapshot.paths)
+    filtered = {ext: count for ext, count in extensions.items() if count >= min_count} or extensions
+    new_files = _count_created_by_directory(context.created_events, context.root_path)
+    summary = {
+        "files": len(snapshot),
+        "total_mb": round(snapshot.total_bytes / (1024 * 1024), 2),
+        "changes": len(context.modified_events),
+        "new_files": len(context.created_events),
+        "extensions": dict(sorted(filtered.items())),
+        "new_dirs": dict(sorted(new_files.items())),
+    }
+    logger.log(
+        level,
+        "Scan summary for %s: %s",
+        context.root_path,
+        summary,
+        extra={"scan_summary": summary},
+    )
+
+
 def run_shell_command(context: ActionContext, options: Dict[str, Any]) -> None:
-    """Execute a templated shell command when an event-driven action fires."""
+    """Execute a templated command when an event-driven action fires.
+
+    The command runs through ``/bin/sh`` by default. With ``shell: false`` it is split
+    with ``shlex`` and executed directly, which skips the intermediate shell process
+    but rules out pipes, redirections, and ``&&`` chains.
+    """
 
-    if context.event is None:
+    event = context.event
+    if event is None:
         logger.debug("run_shell_command skipped: no event in context")
         return
 
@@ -102,51 +139,151 @@ def run_shell_command(context: ActionContext, options: Dict[str, Any]) -> None:
         logger.error("run_shell_command requires a 'command' option")
         return
 
-    event_path = context.event.path
-    values = {
-        "path": str(event_path),
-        "directory": str(event_path.parent),
-        "filename": event_path.name,
-        "root": str(context.root_path),
-    }
-    if context.event.previous_path is not None:
-        prev_path = context.event.previous_path
-        values.update(
-            previous_path=str(prev_path),
-            previous_directory=str(prev_path.parent),
-            previous_filename=prev_path.name,
-        )
-
-    try:
-        command = str(template).format(**values)
-    except KeyError as exc:
-        logger.error("run_shell_command missing placeholder value for '%s'", exc)
-        return
+    event_path = event.path
+    command = _static_command(str(template))
+    if command is None:
+        values = _LazyValues(event, context.root_path)
+        command = str(template).format_map(values)
+        if values.missing:
+            logger.error("run_shell_command missing placeholder value for '%s'", values.missing[0])
+            return
+
+    use_shell = bool(options.get("shell", True))
+    if use_shell:
+        args = command
+    else:
+        try:
+            args = shlex.split(command)
+        except ValueError as exc:
+            logger.error("run_shell_command could not split command '%s': %s", command, exc)
+            return
+        if not args:
+            logger.error("run_shell_command produced an empty command for %s", event_path)
+            return
 
     logger.info("Executing shell command for %s: %s", event_path, command)
+    # The command writes straight to the terminal, so release buffered log lines first.
+    flush_log_handlers()
     try:
-        subprocess.run(command, shell=True, check=True)
+        subprocess.run(args, shell=use_shell, check=True)
     except subprocess.CalledProcessError as exc:
         logger.error("Shell command failed (exit %s): %s", exc.returncode, command)
-
+    except OSError as exc:
+        logger.error("Shell command could not be started (%s): %s", exc, command)
+
+
+
+# Placeholder name -> function computing its value from (event, root_path); None marks
+# a value the event does not have, such as previous_* for anything but a move.
+_PLACEHOLDERS: Dict[str, Callable[[FileEvent, Path], Optional[str]]] = {
+    "path": lambda event, root: str(event.path),
+    "directory": lambda event, root: str(event.path.parent),
+    "filename": lambda event, root: event.path.name,
+    "root": lambda event, root: str(root),
+    "previous_path": lambda event, root: (
+        str(event.previous_path) if event.previous_path is not None else None
+    ),
+    "previous_directory": lambda event, root: (
+        str(event.previous_path.parent) if event.previous_path is not None else None
+    ),
+    "previous_filename": lambda event, root: (
+        event.previous_path.name if event.previous_path is not None else None
+    ),
+}
+
+
+class _LazyValues(dict):
+    """Placeholder values for one event, each computed the first time a template asks.
+
+    Placeholders the event cannot supply format as an empty string and are recorded
+    in ``missing``, so callers check once after formatting instead of catching KeyError.
+    """
+
+    __slots__ = ("_event", "_root", "missing")
+
+    def __init__(self, event: FileEvent, root: Path) -> None:
+        super().__init__()
+        self._event = event
+        self._root = root
+        self.missing: List[str] = []
+
+    def __missing__(self, key: str) -> str:
+        getter = _PLACEHOLDERS.get(key)
+        value = getter(self._event, self._root) if getter is not None else None
+        if value is None:
+            self.missing.append(key)
+            return ""
+        self[key] = value
+        return value
+
+
+@functools.lru_cache(maxsize=128)
+def _static_command(template: str) -> Optional[str]:
+    """Return the final text of a template without placeholders, or None if it has any.
+
+    The ``{{``/``}}`` escapes are already resolved, so the result can be used without
+    formatting. The answer is cached per template string.
+    """
+
+    parsed = list(Formatter().parse(template))
+    if any(field_name is not None for _, field_name, _, _ in parsed):
+        return None
+    return "".join(literal for literal, _, _, _ in parsed)
+
+
+def _count_created_by_directory(created_events: Iterable[FileEvent], root_path) -> Counter:
+    """Count created files per directory relative to ``root_path``."""
+
+    root = os.fspath(root_path)
+    # Sibling files share a parent, so resolve each parent directory only once.
+    relative_cache: Dict[str, str] = {}
+    cached_relative = relative_cache.get
+
+    def relative_parent(parent: str) -> str:
+        directory = cached_relative(parent)
+        if directory is None:
+            directory = relative_cache[parent] = _relative_directory(parent, root)
+        return directory
+
+    # Event paths are absolute, so string dirname() agrees with Path.parent.
+    dirname = os.path.dirname
+    fspath = os.fspath
+    return Counter(relative_parent(dirname(fspath(event.path))) for event in created_events)
+
+
+def _count_suffixes(paths: Iterable[str]) -> Counter:
+    """Count lower-cased extensions (``"<no-ext>"`` for none) across path strings.
+
+    Raw suffixes are counted first, so lower-casing happens once per distinct suffix
+    rather than once per path.
+    """
+
+    counts: Counter = Counter()
+    raw_counts = Counter(os.path.splitext(path)[1] for path in paths)
+    for suffix, count in raw_counts.items():
+        if suffix == ".":
+            # A trailing dot ("file.") is not an extension, matching Path.suffix.
+            suffix = ""
+        counts[suffix.lower() or "<no-ext>"] += count
+    return counts
 
 
 def _describe_event(event) -> str:
-    details = [f"type={event.event_type}", f"path={event.path}"]
-    if event.size is not None:
-        details.append(f"size={event.size}")
-    if event.mtime is not None:
-        details.append(f"mtime={event.mtime}")
-    if event.previous_path:
-        details.append(f"previous={event.previous_path}")
-    return ", ".join(details)
+    return (
+        f"type={event.event_type}, path={event.path}"
+        + (f", size={event.size}" if event.size is not None else "")
+        + (f", mtime={event.mtime}" if event.mtime is not None else "")
+        + (f", previous={event.previous_path}" if event.previous_path else "")
+    )
 
 
-def _relative_directory(directory, root_path):
-    try:
-        relative = directory.relative_to(root_path)
-        if str(relative) == ".":
-            return "."
-        return str(relative)
-    except ValueError:
-        return str(directory)
+def _relative_directory(directory: str, root_path) -> str:
+    # Plain string prefix test: tracked paths are built from the root, so this gives
+    # the same answer as Path.relative_to without raising for paths outside the root.
+    root = os.fspath(root_path)
+    if directory == root:
+        return "."
+    root_prefix = os.path.join(root, "")
+    if directory.startswith(root_prefix):
+        return directory[len(root_prefix):]
+    return directory
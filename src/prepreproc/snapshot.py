@@ -0,0 +1,234 @@
+"""Compact file snapshots and the diff that turns two snapshots into events."""
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass, field
+from itertools import compress, filterfalse
+from operator import ne, or_
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from .events import EventType, FileEvent
+
+
+@dataclass(frozen=True)
+class DirectoryDigest:
+    """Roll-up of the files a scan recorded for one directory."""
+
+    start: int  # Position of the directory's first entry in the snapshot arrays
+    count: int
+    digest: int  # XOR of hash((name, mtime, size)) over the directory's files
+
+
+@dataclass(eq=False)
+class Snapshot(Mapping[str, Tuple[float, int]]):
+    """Metadata for every tracked file, keyed by path string.
+
+    Entries are stored as parallel arrays (structure of arrays): ``paths[i]`` has
+    modification time ``mtimes[i]`` and size ``sizes[i]``, and ``index`` maps a path
+    back to ``i``. The numeric columns hold raw C doubles and 64-bit integers rather
+    than a tuple of boxed Python objects per file. The class still behaves as a
+    read-only mapping of ``path -> (mtime, size)`` so action callbacks can use it like
+    a dict.
+
+    ``generation`` increases by one with every snapshot the monitor publishes, so
+    consumers can remember "the state at generation N" as a plain integer and pair it
+    with the change log instead of holding on to a copy of the snapshot.
+
+    Snapshots built by a full scan also carry a ``DirectoryDigest`` per directory, which
+    lets ``diff_snapshots`` skip directories whose files are unchanged. Editing entries
+    in place with ``set`` or ``remove`` discards the digests.
+    """
+
+    index: Dict[str, int] = field(default_factory=dict)
+    paths: List[str] = field(default_factory=list)
+    mtimes: array = field(default_factory=lambda: array("d"))
+    sizes: array = field(default_factory=lambda: array("q"))
+    directories: Dict[str, DirectoryDigest] = field(default_factory=dict)
+    generation: int = 0
+    _total_bytes: Optional[int] = field(default=None, init=False, repr=False)
+
+    def __getitem__(self, path: str) -> Tuple[float, int]:
+        position = self.index[path]
+        return (self.mtimes[position], self.sizes[position])
+
+    def __contains__(self, path: object) -> bool:
+        return path in self.index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.paths)
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def entries(self) -> Iterator[Tuple[str, float, int]]:
+        """Iterate ``(path, mtime, size)`` without a per-entry index lookup."""
+
+        return zip(self.paths, self.mtimes, self.sizes)
+
+    @property
+    def total_bytes(self) -> int:
+        """Sum of every tracked file size, computed once and cached until the snapshot is edited."""
+
+        if self._total_bytes is None:
+            self._total_bytes = sum(self.sizes)
+        return self._total_bytes
+
+    def add(self, path: str, mtime: float, size: int) -> None:
+        """Append a path that is not yet part of the snapshot."""
+
+        self._total_bytes = None
+        self.index[path] = len(self.paths)
+        self.paths.append(path)
+        self.mtimes.append(mtime)
+        self.sizes.append(size)
+
+    def add_directory(self, directory: str, files: Iterable[Tuple[str, str, float, int]]) -> None:
+        """Append one directory's ``(path, name, mtime, size)`` files and record their digest."""
+
+        start = len(self.paths)
+        digest = 0
+        for path, name, mtime, size in files:
+            self.add(path, mtime, size)
+            digest ^= hash((name, mtime, size))
+        if len(self.paths) > start:
+            self.directories[directory] = DirectoryDigest(start=start, count=len(self.paths) - start, digest=digest)
+
+    def set(self, path: str, mtime: float, size: int) -> None:
+        """Insert a path or overwrite the metadata recorded for it."""
+
+        self.directories.clear()
+        self._total_bytes = None
+        position = self.index.get(path)
+        if position is None:
+            self.add(path, mtime, size)
+            return
+        self.mtimes[position] = mtime
+        self.sizes[position] = size
+
+    def remove(self, path: str) -> None:
+        """Drop a path by moving the last entry into its slot; raises KeyError if absent."""
+
+        position = self.index.pop(path)
+        self.directories.clear()
+        self._total_bytes = None
+        last_path = self.paths.pop()
+        last_mtime = self.mtimes.pop()
+        last_size = self.sizes.pop()
+        if last_path != path:
+            self.index[last_path] = position
+            self.paths[position] = last_path
+            self.mtimes[position] = last_mtime
+            self.sizes[position] = last_size
+
+    def copy(self) -> "Snapshot":
+        """Return an independent snapshot with the same entries."""
+
+        return Snapshot(
+            index=dict(self.index),
+            paths=list(self.paths),
+            mtimes=array("d", self.mtimes),
+            sizes=array("q", self.sizes),
+            directories=dict(self.directories),
+            generation=self.generation,
+        )
+
+
+def diff_snapshots(old: Snapshot, new: Snapshot) -> Iterator[FileEvent]:
+    """Yield the CREATED, MODIFIED, and DELETED events that turn ``old`` into ``new``.
+
+    When both snapshots carry directory digests, a directory whose file count and
+    digest are unchanged is skipped without comparing its files; only directories that
+    differ are handed to ``diff_positions``. The deletion pass is skipped outright when
+    every old path was matched. ``FileEvent`` objects are built only for the positions
+    the comparison reports.
+    """
+
+    created: List[int] = []
+    modified: List[int] = []
+    if old.directories and new.directories:
+        old_directories = old.directories
+        for directory, summary in new.directories.items():
+            previous = old_directories.get(directory)
+            if previous is None:
+                old_range = (0, 0)
+            elif previous.count == summary.count and previous.digest == summary.digest:
+                continue
+            else:
+                old_range = (previous.start, previous.start + previous.count)
+            range_created, range_modified = diff_positions(
+                old, new, (summary.start, summary.start + summary.count), old_range
+            )
+            created.extend(range_created)
+            modified.extend(range_modified)
+    else:
+        created, modified = diff_positions(old, new, (0, len(new)), (0, len(old)))
+
+    for position in created:
+        yield FileEvent(
+            event_type=EventType.CREATED,
+            path=Path(new.paths[position]),
+            size=new.sizes[position],
+            mtime=new.mtimes[position],
+        )
+    for position in modified:
+        yield FileEvent(
+            event_type=EventType.MODIFIED,
+            path=Path(new.paths[position]),
+            size=new.sizes[position],
+            mtime=new.mtimes[position],
+        )
+
+    # Every new path that was not created matched an old path.
+    if len(new) - len(created) == len(old):
+        return
+
+    old_index = old.index
+    for path in filterfalse(new.index.__contains__, old.paths):
+        position = old_index[path]
+        yield FileEvent(
+            event_type=EventType.DELETED,
+            path=Path(path),
+            size=old.sizes[position],
+            mtime=old.mtimes[position],
+        )
+
+
+def diff_positions(
+    old: Snapshot,
+    new: Snapshot,
+    new_range: Tuple[int, int],
+    old_range: Tuple[int, int],
+) -> Tuple[List[int], List[int]]:
+    """Compare ``new`` entries in ``new_range`` against ``old``.
+
+    Returns two lists of positions into ``new``: entries missing from ``old`` (created)
+    and entries whose mtime or size differ (modified). ``old_range`` names the slice of
+    ``old`` that should hold the same files. When both slices list the same paths in
+    the same order, the numeric columns are compared with ``map``/``compress`` so the
+    per-entry work runs inside C iterators instead of the bytecode loop.
+    """
+
+    new_start, new_end = new_range
+    old_start, old_end = old_range
+    new_paths = new.paths[new_start:new_end]
+    if old.paths[old_start:old_end] == new_paths:
+        differs = map(
+            or_,
+            map(ne, old.mtimes[old_start:old_end], new.mtimes[new_start:new_end]),
+            map(ne, old.sizes[old_start:old_end], new.sizes[new_start:new_end]),
+        )
+        return [], list(compress(range(new_start, new_end), differs))
+
+    created: List[int] = []
+    modified: List[int] = []
+    old_mtimes = old.mtimes
+    old_sizes = old.sizes
+    new_mtimes = new.mtimes
+    new_sizes = new.sizes
+    for position, old_position in zip(range(new_start, new_end), map(old.index.get, new_paths)):
+        if old_position is None:
+            created.append(position)
+        elif old_mtimes[old_position] != new_mtimes[position] or old_sizes[old_position] != new_sizes[position]:
+            modified.append(position)
+    return created, modified
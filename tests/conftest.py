@@ -0,0 +1,118 @@
+"""Shared pytest fixtures for the prepreproc test suite."""
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import pytest
+
+# The package uses a src/ layout and is not installed for the tests.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from prepreproc.actions import ActionRegistry  # noqa: E402
+from prepreproc.config import ActionConfig, ActionTriggerConfig, MonitorBackend, MonitorConfig  # noqa: E402
+from prepreproc.inotify import Inotify, inotify_available  # noqa: E402
+from prepreproc.monitor import DirectoryMonitor, InotifyMonitor, create_monitor  # noqa: E402
+
+
+def event_action_registry() -> ActionRegistry:
+    """Return a registry with one event-triggered action, so monitors build events."""
+
+    return ActionRegistry(
+        [
+            ActionConfig(
+                name="log",
+                module="prepreproc.sample_actions",
+                function="log_event",
+                trigger=ActionTriggerConfig(),
+            )
+        ]
+    )
+
+
+def record_context(context, options) -> None:
+    """Action callback that appends each context it receives to ``options["calls"]``.
+
+    When ``options["order"]`` is set, the action's name is appended to it as well, so
+    several actions can record the order they ran in.
+    """
+
+    options["calls"].append(context)
+    if "order" in options:
+        options["order"].append(options["name"])
+
+
+def recording_action(
+    name: str, trigger: ActionTriggerConfig, calls: list, order: Optional[list] = None
+) -> ActionConfig:
+    """Return an action configuration whose callback records its contexts into ``calls``."""
+
+    options = {"calls": calls, "name": name}
+    if order is not None:
+        options["order"] = order
+    return ActionConfig(name=name, module="conftest", function="record_context", trigger=trigger, options=options)
+
+
+class MonitorHarness:
+    """Drives a monitor one detection cycle at a time instead of running its loop.
+
+    ``start`` performs the same setup as ``run`` (watches first for inotify, then the
+    seed scan) and ``cycle`` runs a single change detection, returning the events as
+    sorted ``(event type value, path relative to the root)`` pairs.
+    """
+
+    def __init__(self, monitor: DirectoryMonitor, root: Path) -> None:
+        self.monitor = monitor
+        self.root = root
+
+    def start(self) -> None:
+        monitor = self.monitor
+        if isinstance(monitor, InotifyMonitor):
+            monitor._inotify = Inotify()
+            monitor._watch_tree(str(self.root))
+        monitor._snapshot = monitor._scan()
+
+    def cycle(self) -> List[Tuple[str, str]]:
+        events, snapshot = self.monitor._detect_changes()
+        self.monitor._snapshot = snapshot
+        return sorted((event.event_type.value, os.path.relpath(event.path, self.root)) for event in events)
+
+    def close(self) -> None:
+        monitor = self.monitor
+        if isinstance(monitor, InotifyMonitor) and monitor._inotify is not None:
+            monitor._inotify.close()
+            monitor._inotify = None
+            monitor._watches.clear()
+            monitor._root_wd = None
+            monitor._unwatched.clear()
+
+
+@pytest.fixture(params=[MonitorBackend.POLLING, MonitorBackend.INOTIFY])
+def backend(request) -> MonitorBackend:
+    """Run a test once per monitor backend, skipping inotify where it is unavailable."""
+
+    if request.param is MonitorBackend.INOTIFY and not inotify_available():
+        pytest.skip("inotify is not available on this platform")
+    return request.param
+
+
+@pytest.fixture
+def make_harness(tmp_path: Path):
+    """Return a factory building a started ``MonitorHarness`` over ``tmp_path / "root"``."""
+
+    harnesses: List[MonitorHarness] = []
+
+    def factory(backend: MonitorBackend, **config_options) -> MonitorHarness:
+        root = tmp_path / "root"
+        root.mkdir(exist_ok=True)
+        config = MonitorConfig(root_path=root, poll_interval=0.05, backend=backend, **config_options)
+        harness = MonitorHarness(create_monitor(config, event_action_registry()), root)
+        harness.start()
+        harnesses.append(harness)
+        return harness
+
+    yield factory
+    for harness in harnesses:
+        harness.close()
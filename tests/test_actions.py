@@ -0,0 +1,200 @@
+"""Tests for action contexts, scheduling, and the change log."""
+from __future__ import annotations
+
+import logging
+import time
+from datetime import datetime, timedelta
+from datetime import time as dt_time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import pytest
+
+from prepreproc.actions import ActionContext, ActionRegistry, _compute_next_run, resolve_log_level
+from prepreproc.config import ActionTriggerConfig, TriggerType
+from prepreproc.events import EventType, FileEvent
+from prepreproc.snapshot import Snapshot
+
+from conftest import recording_action
+
+
+def _event(event_type: EventType, name: str) -> FileEvent:
+    return FileEvent(event_type=event_type, path=Path("/data") / name)
+
+
+def test_context_derives_created_events_when_omitted():
+    created = _event(EventType.CREATED, "a.fits")
+    modified = _event(EventType.MODIFIED, "b.fits")
+
+    scheduled = ActionContext(root_path=Path("/data"), snapshot=Snapshot(), modified_events=[created, modified])
+    assert scheduled.created_events == [created]
+
+    per_event = ActionContext(root_path=Path("/data"), snapshot=Snapshot(), event=modified)
+    assert per_event.created_events == []
+
+
+def test_context_keeps_created_events_passed_in():
+    created = _event(EventType.CREATED, "a.fits")
+    shared = [created]
+    context = ActionContext(root_path=Path("/data"), snapshot=Snapshot(), modified_events=[], created_events=shared)
+    assert context.created_events is shared
+
+
+def _registry(reference: datetime, **triggers: ActionTriggerConfig) -> Tuple[ActionRegistry, Dict[str, list]]:
+    calls: Dict[str, list] = {name: [] for name in triggers}
+    configs = [recording_action(name, trigger, calls[name]) for name, trigger in triggers.items()]
+    return ActionRegistry(configs, reference_time=reference), calls
+
+
+def _minutely_registry(reference: datetime) -> Tuple[ActionRegistry, Dict[str, list]]:
+    return _registry(reference, summary=ActionTriggerConfig(type=TriggerType.MINUTELY))
+
+
+class _Cycles:
+    """Feeds one monitor cycle at a time into a registry, one second apart."""
+
+    def __init__(self, registry: ActionRegistry, start: datetime) -> None:
+        self.registry = registry
+        self.now = start
+        self.generation = 0
+
+    def run(self, *events: FileEvent, seconds: int = 1) -> None:
+        self.generation += 1
+        self.now += timedelta(seconds=seconds)
+        self.registry.dispatch_scheduled(
+            now=self.now,
+            root_path=Path("/data"),
+            snapshot=Snapshot(generation=self.generation),
+            cycle_events=list(events),
+        )
+
+
+def _net(context: ActionContext) -> List[Tuple[str, str]]:
+    return [(event.event_type.value, event.path.name) for event in context.modified_events]
+
+
+START = datetime(2026, 1, 1, 12, 0, 30)
+
+
+def test_file_created_then_deleted_is_not_reported():
+    registry, calls = _minutely_registry(START)
+    cycles = _Cycles(registry, START)
+    cycles.run(_event(EventType.CREATED, "kept.fits"), _event(EventType.CREATED, "temp.fits"))
+    cycles.run(_event(EventType.DELETED, "temp.fits"))
+    cycles.run(seconds=30)  # crosses 12:01:00
+
+    (context,) = calls["summary"]
+    assert _net(context) == [("created", "kept.fits")]
+    assert [event.path.name for event in context.created_events] == ["kept.fits"]
+
+
+def test_events_are_coalesced_per_path():
+    registry, calls = _minutely_registry(START)
+    cycles = _Cycles(registry, START)
+    cycles.run(_event(EventType.CREATED, "new.fits"), _event(EventType.DELETED, "replaced.fits"))
+    cycles.run(_event(EventType.MODIFIED, "new.fits"), _event(EventType.CREATED, "replaced.fits"))
+    cycles.run(_event(EventType.MODIFIED, "old.fits"))
+    cycles.run(_event(EventType.MODIFIED, "old.fits"), _event(EventType.DELETED, "gone.fits"))
+    cycles.run(seconds=30)
+
+    (context,) = calls["summary"]
+    assert _net(context) == [
+        ("created", "new.fits"),
+        ("modified", "replaced.fits"),
+        ("modified", "old.fits"),
+        ("deleted", "gone.fits"),
+    ]
+
+
+def test_each_action_receives_changes_since_its_own_last_run():
+    # "fast" fires every minute; "slow" first fires at 12:02:00.
+    registry, calls = _registry(
+        START,
+        fast=ActionTriggerConfig(type=TriggerType.MINUTELY),
+        slow=ActionTriggerConfig(type=TriggerType.HOURLY, minute=2),
+    )
+
+    cycles = _Cycles(registry, START)
+    cycles.run(_event(EventType.CREATED, "a.fits"))
+    cycles.run(seconds=30)  # 12:01:01 -> fast fires
+    cycles.run(_event(EventType.CREATED, "b.fits"))
+    cycles.run(_event(EventType.MODIFIED, "a.fits"), seconds=60)  # 12:02:02 -> both fire
+
+    assert [_net(context) for context in calls["fast"]] == [
+        [("created", "a.fits")],
+        [("created", "b.fits"), ("modified", "a.fits")],
+    ]
+    assert [_net(context) for context in calls["slow"]] == [
+        [("created", "a.fits"), ("created", "b.fits")],
+    ]
+    # Every action is caught up, so the log is empty again.
+    assert not registry._change_log
+
+
+def test_change_log_memory_is_bounded_by_changed_paths():
+    registry, _calls = _minutely_registry(START)
+    cycles = _Cycles(registry, START)
+    for _ in range(20):
+        cycles.run(_event(EventType.MODIFIED, "growing.fits"))
+
+    assert len(registry._change_log) == 1
+    assert len(registry._change_log[0].changes) == 1
+
+
+def test_minutely_next_run_is_later_than_reference_across_dst_fall_back(monkeypatch):
+    # 2026-11-01 01:59:30 in New York is just before clocks fall back from 02:00 EDT to 01:00 EST.
+    if not hasattr(time, "tzset"):
+        pytest.skip("time.tzset is not available on this platform")
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    try:
+        reference = datetime(2026, 11, 1, 1, 59, 30)
+        next_run = _compute_next_run(ActionTriggerConfig(type=TriggerType.MINUTELY), reference)
+        assert next_run == datetime(2026, 11, 1, 2, 0, 0)
+        assert next_run > reference
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+
+
+def test_minutely_next_run_honours_trigger_second():
+    trigger = ActionTriggerConfig(type=TriggerType.MINUTELY, time=dt_time(0, 0, 15))
+    assert _compute_next_run(trigger, datetime(2026, 1, 1, 12, 0, 10)) == datetime(2026, 1, 1, 12, 0, 15)
+    assert _compute_next_run(trigger, datetime(2026, 1, 1, 12, 0, 15)) == datetime(2026, 1, 1, 12, 1, 15)
+
+
+def test_scheduled_actions_due_together_fire_in_configuration_order():
+    order: List[str] = []
+    configs = [
+        recording_action(name, ActionTriggerConfig(type=TriggerType.MINUTELY), [], order)
+        for name in ("first", "second", "third")
+    ]
+    cycles = _Cycles(ActionRegistry(configs, reference_time=START), START)
+    cycles.run(seconds=30)
+    cycles.run(seconds=60)
+    assert order == ["first", "second", "third"] * 2
+
+
+def test_scheduled_action_fires_once_per_interval():
+    registry, calls = _minutely_registry(START)
+    cycles = _Cycles(registry, START)
+    for _ in range(120):  # two minutes of one-second cycles
+        cycles.run()
+    assert len(calls["summary"]) == 2
+
+
+def test_event_actions_receive_each_event():
+    calls: list = []
+    registry = ActionRegistry([recording_action("on-event", ActionTriggerConfig(), calls)])
+    event = _event(EventType.CREATED, "a.fits")
+    registry.dispatch_event(event, root_path=Path("/data"), snapshot=Snapshot())
+    (context,) = calls
+    assert context.event is event
+    assert context.created_events == [event]
+
+
+def test_resolve_log_level_accepts_names_and_falls_back_to_info():
+    assert resolve_log_level({}) == logging.INFO
+    assert resolve_log_level({"level": "debug"}) == logging.DEBUG
+    assert resolve_log_level({"level": "WARN"}) == logging.WARNING
+    assert resolve_log_level({"level": "not-a-level"}) == logging.INFO
@@ -0,0 +1,61 @@
+"""Tests for the file cleanup action callbacks."""
+from __future__ import annotations
+
+import logging
+import time
+from pathlib import Path
+
+from prepreproc import cleanup_actions
+from prepreproc.actions import ActionContext
+from prepreproc.snapshot import Snapshot
+
+ROOT = Path("/data")
+DAY = 86400
+
+
+def _context(entries) -> ActionContext:
+    snapshot = Snapshot()
+    for path, mtime in entries:
+        snapshot.add(path, mtime, 1)
+    return ActionContext(root_path=ROOT, snapshot=snapshot)
+
+
+def _messages(caplog, context: ActionContext, options) -> list:
+    caplog.clear()
+    with caplog.at_level(logging.INFO, logger="prepreproc.cleanup_actions"):
+        cleanup_actions.list_old_files(context, options)
+    return [record.getMessage() for record in caplog.records]
+
+
+def test_list_old_files_counts_old_files_per_directory(caplog):
+    now = time.time()
+    context = _context(
+        [
+            ("/data/cam1/new.fits", now - DAY),
+            ("/data/cam1/a.fits", now - 10 * DAY),
+            ("/data/cam1/b.fits", now - 9 * DAY),
+            ("/data/c.fits", now - 30 * DAY),
+            ("/data/cam2/night/d.fits", now - 8 * DAY),
+            ("/data/cam2/night/e.fits", now - 2 * DAY),
+            ("/elsewhere/f.fits", now - 40 * DAY),
+        ]
+    )
+    assert _messages(caplog, context, {"threshold_days": 7}) == [
+        "Files older than 7 days (5 total) for /data -> cam1: 2, .: 1, /elsewhere: 1, cam2/night: 1"
+    ]
+
+
+def test_list_old_files_reports_when_nothing_is_old(caplog):
+    context = _context([("/data/a.fits", time.time())])
+    assert _messages(caplog, context, {"threshold_days": 1.5}) == ["No files older than 1.5 days for /data"]
+
+
+def test_list_old_files_rejects_bad_thresholds(caplog):
+    context = _context([])
+    assert _messages(caplog, context, {}) == ["list_old_files requires a 'threshold_days' option"]
+    assert _messages(caplog, context, {"threshold_days": "soon"}) == [
+        "list_old_files received non-numeric 'threshold_days': 'soon'"
+    ]
+    assert _messages(caplog, context, {"threshold_days": -1}) == [
+        "list_old_files received negative 'threshold_days': -1.0"
+    ]
@@ -0,0 +1,51 @@
+"""Tests for configuration parsing."""
+from __future__ import annotations
+
+from datetime import time as dt_time
+
+import pytest
+
+from prepreproc.config import ConfigError, MonitorBackend, TriggerType, load_config
+
+
+def _write_config(tmp_path, text: str):
+    path = tmp_path / "config.yaml"
+    path.write_text(text)
+    return path
+
+
+def test_monitor_backend_defaults_to_auto(tmp_path):
+    config = load_config(_write_config(tmp_path, "monitor:\n  root_path: ./data\n"))
+    assert config.monitor.backend is MonitorBackend.AUTO
+    assert config.monitor.root_path == (tmp_path / "data").resolve()
+
+
+def test_monitor_backend_is_parsed(tmp_path):
+    config = load_config(_write_config(tmp_path, "monitor:\n  root_path: ./data\n  backend: polling\n"))
+    assert config.monitor.backend is MonitorBackend.POLLING
+
+
+def test_unknown_monitor_backend_is_rejected(tmp_path):
+    with pytest.raises(ConfigError, match="monitor.backend must be one of"):
+        load_config(_write_config(tmp_path, "monitor:\n  root_path: ./data\n  backend: fsevents\n"))
+
+
+def test_trigger_second_is_taken_from_time(tmp_path):
+    config = load_config(
+        _write_config(
+            tmp_path,
+            "monitor:\n"
+            "  root_path: ./data\n"
+            "actions:\n"
+            "  - name: every-minute\n"
+            "    module: prepreproc.sample_actions\n"
+            "    function: log_event\n"
+            "    trigger:\n"
+            "      type: minutely\n"
+            "      time: '00:00:15'\n",
+        )
+    )
+    (action,) = config.actions
+    assert action.trigger.type is TriggerType.MINUTELY
+    assert action.trigger.time == dt_time(0, 0, 15)
+    assert action.trigger.second == 15
@@ -0,0 +1,49 @@
+"""Tests for the ctypes inotify bindings."""
+from __future__ import annotations
+
+import pytest
+
+from prepreproc.inotify import IN_CREATE, IN_IGNORED, IN_ISDIR, Inotify, inotify_available
+
+pytestmark = pytest.mark.skipif(not inotify_available(), reason="inotify is not available")
+
+
+@pytest.fixture
+def inotify():
+    instance = Inotify()
+    yield instance
+    instance.close()
+
+
+def test_read_events_reports_created_entries(inotify, tmp_path):
+    wd = inotify.add_watch(str(tmp_path))
+    (tmp_path / "a.fits").write_text("1")
+    (tmp_path / "sub").mkdir()
+
+    created = {event.name: event for event in inotify.read_events() if event.mask & IN_CREATE}
+    assert set(created) == {"a.fits", "sub"}
+    assert created["a.fits"].wd == wd
+    assert not created["a.fits"].mask & IN_ISDIR
+    assert created["sub"].mask & IN_ISDIR
+
+
+def test_read_events_is_non_blocking_when_idle(inotify, tmp_path):
+    inotify.add_watch(str(tmp_path))
+    assert inotify.read_events() == []
+
+
+def test_remove_watch_queues_ignored_event(inotify, tmp_path):
+    wd = inotify.add_watch(str(tmp_path))
+    inotify.remove_watch(wd)
+    assert [event.wd for event in inotify.read_events() if event.mask & IN_IGNORED] == [wd]
+
+
+def test_add_watch_on_missing_directory_raises(inotify, tmp_path):
+    with pytest.raises(FileNotFoundError):
+        inotify.add_watch(str(tmp_path / "missing"))
+
+
+def test_close_is_idempotent(tmp_path):
+    instance = Inotify()
+    instance.close()
+    instance.close()
@@ -0,0 +1,57 @@
+"""Tests for the command-line entry point's buffered log output."""
+from __future__ import annotations
+
+import io
+import logging
+import sys
+
+from prepreproc import __main__ as cli
+
+
+def _record(level: int, message: str) -> logging.LogRecord:
+    return logging.LogRecord("prepreproc.test", level, __file__, 1, message, None, None)
+
+
+class _FlushCountingStream(io.StringIO):
+    """In-memory stream that counts how often it was flushed."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.flushes = 0
+
+    def flush(self) -> None:
+        self.flushes += 1
+        super().flush()
+
+
+def test_buffered_handler_only_flushes_at_flush_level():
+    stream = _FlushCountingStream()
+    handler = cli._BufferedStreamHandler(stream, flush_level=logging.ERROR)
+
+    handler.emit(_record(logging.INFO, "first"))
+    handler.emit(_record(logging.WARNING, "second"))
+    assert stream.getvalue() == "first\nsecond\n"
+    assert stream.flushes == 0
+
+    handler.emit(_record(logging.ERROR, "broken"))
+    assert stream.flushes == 1
+
+    handler.flush()
+    assert stream.flushes == 2
+
+
+def test_buffered_stderr_holds_output_until_flushed(tmp_path, monkeypatch):
+    target = tmp_path / "stderr.log"
+    with open(target, "w", encoding="utf-8") as fake_stderr:
+        monkeypatch.setattr(sys, "stderr", fake_stderr)
+        stream = cli._buffered_stderr()
+        stream.write("buffered line\n")
+        assert target.read_text() == ""
+        stream.flush()
+        assert target.read_text() == "buffered line\n"
+
+
+def test_buffered_stderr_falls_back_when_stderr_has_no_descriptor(monkeypatch):
+    replacement = io.StringIO()
+    monkeypatch.setattr(sys, "stderr", replacement)
+    assert cli._buffered_stderr() is replacement
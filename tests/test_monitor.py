@@ -0,0 +1,242 @@
+"""Tests for the polling and inotify monitor backends."""
+from __future__ import annotations
+
+import errno
+import logging
+import os
+import shutil
+import threading
+import time
+
+import pytest
+
+from prepreproc import monitor as monitor_module
+from prepreproc.config import MonitorBackend, MonitorConfig
+from prepreproc.inotify import Inotify, inotify_available
+from prepreproc.monitor import DirectoryMonitor, InotifyMonitor, create_monitor
+
+from conftest import event_action_registry
+
+requires_inotify = pytest.mark.skipif(not inotify_available(), reason="inotify is not available")
+
+
+@requires_inotify
+def test_unwatchable_subdirectory_falls_back_to_scanning(make_harness, monkeypatch, caplog):
+    # A directory whose watch fails (ENOSPC once max_user_watches is used up) must still
+    # report changes, and the failure must be visible at WARNING.
+    harness = make_harness(MonitorBackend.INOTIFY)
+    blocked = harness.root / "blocked"
+    blocked_path = str(blocked)
+    original_add_watch = Inotify.add_watch
+
+    def add_watch(self, path, *args, **kwargs):
+        if path == blocked_path:
+            raise OSError(errno.ENOSPC, "No space left on device", path)
+        return original_add_watch(self, path, *args, **kwargs)
+
+    monkeypatch.setattr(Inotify, "add_watch", add_watch)
+    with caplog.at_level(logging.WARNING, logger="prepreproc.monitor"):
+        blocked.mkdir()
+        (blocked / "a.fits").write_text("1")
+        assert harness.cycle() == [("created", "blocked/a.fits")]
+    assert any("Unable to watch" in record.getMessage() for record in caplog.records)
+
+    # Still unwatched: the full scan picks up the next file too, without a new warning.
+    caplog.clear()
+    (blocked / "b.fits").write_text("2")
+    assert harness.cycle() == [("created", "blocked/b.fits")]
+    assert not [record for record in caplog.records if record.levelno >= logging.WARNING]
+
+    # Once the watch succeeds, incremental updates resume.
+    monkeypatch.setattr(Inotify, "add_watch", original_add_watch)
+    assert harness.cycle() == []
+    assert harness.monitor._unwatched == set()
+    (blocked / "c.fits").write_text("3")
+    assert harness.cycle() == [("created", "blocked/c.fits")]
+
+
+@requires_inotify
+def test_inotify_start_failure_degrades_to_polling(tmp_path, monkeypatch, caplog):
+    def failing_inotify():
+        raise OSError(errno.EMFILE, "Too many open files")
+
+    monkeypatch.setattr(monitor_module, "Inotify", failing_inotify)
+    root = tmp_path / "root"
+    root.mkdir()
+    config = MonitorConfig(root_path=root, poll_interval=0.01, backend=MonitorBackend.INOTIFY)
+    monitor = InotifyMonitor(config, event_action_registry())
+
+    thread = threading.Thread(target=monitor.run)
+    with caplog.at_level(logging.WARNING, logger="prepreproc.monitor"):
+        thread.start()
+        try:
+            assert _wait_until(lambda: monitor._stats.cycles > 0)
+            (root / "a.fits").write_text("1")
+            assert _wait_until(lambda: monitor._stats.events_emitted > 0)
+        finally:
+            monitor.stop()
+            thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert monitor._stats.events_emitted == 1
+    assert any("falling back to polling" in record.getMessage() for record in caplog.records)
+
+
+def test_missing_root_logs_one_warning_per_cycle(make_harness, backend, caplog):
+    harness = make_harness(backend)
+    harness.root.rmdir()
+    # The first cycle may only consume the inotify removal events; later cycles scan.
+    harness.cycle()
+    for _ in range(2):
+        caplog.clear()
+        with caplog.at_level(logging.WARNING, logger="prepreproc.monitor"):
+            assert harness.cycle() == []
+        warnings = [record for record in caplog.records if record.levelno >= logging.WARNING]
+        assert len(warnings) == 1
+        assert "does not exist" in warnings[0].getMessage()
+
+
+def test_renamed_root_is_rescanned_and_watched_again(make_harness, backend):
+    harness = make_harness(backend)
+    (harness.root / "cam1").mkdir()
+    (harness.root / "cam1" / "a.fits").write_text("1")
+    harness.cycle()
+
+    # The old tree keeps its watches under inotify; they must not hide the new root.
+    harness.root.rename(harness.root.with_name("old"))
+    assert harness.cycle() == [("deleted", "cam1/a.fits")]
+
+    harness.root.mkdir()
+    (harness.root / "b.fits").write_text("2")
+    assert harness.cycle() == [("created", "b.fits")]
+    (harness.root / "cam2").mkdir()
+    (harness.root / "cam2" / "c.fits").write_text("3")
+    assert harness.cycle() == [("created", "cam2/c.fits")]
+
+
+def _wait_until(condition, timeout: float = 5.0) -> bool:
+    """Poll ``condition`` until it is true or ``timeout`` seconds pass."""
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+def test_create_modify_and_delete_files(make_harness, backend):
+    harness = make_harness(backend)
+    target = harness.root / "frame.fits"
+
+    target.write_text("1")
+    assert harness.cycle() == [("created", "frame.fits")]
+
+    target.write_text("1234")
+    assert harness.cycle() == [("modified", "frame.fits")]
+
+    assert harness.cycle() == []
+
+    target.unlink()
+    assert harness.cycle() == [("deleted", "frame.fits")]
+
+
+def test_moving_a_file_reports_delete_and_create(make_harness, backend):
+    harness = make_harness(backend)
+    (harness.root / "night1").mkdir()
+    (harness.root / "night1" / "a.fits").write_text("1")
+    harness.cycle()
+
+    (harness.root / "night2").mkdir()
+    (harness.root / "night1" / "a.fits").rename(harness.root / "night2" / "a.fits")
+    assert harness.cycle() == [("created", "night2/a.fits"), ("deleted", "night1/a.fits")]
+
+
+def test_directory_rename_moves_every_file_and_stays_watched(make_harness, backend):
+    harness = make_harness(backend)
+    nested = harness.root / "incoming" / "cam1"
+    nested.mkdir(parents=True)
+    (nested / "a.fits").write_text("1")
+    (harness.root / "incoming" / "b.fits").write_text("2")
+    harness.cycle()
+
+    (harness.root / "incoming").rename(harness.root / "archived")
+    assert harness.cycle() == [
+        ("created", "archived/b.fits"),
+        ("created", "archived/cam1/a.fits"),
+        ("deleted", "incoming/b.fits"),
+        ("deleted", "incoming/cam1/a.fits"),
+    ]
+
+    # Files written into the renamed tree are still reported.
+    (harness.root / "archived" / "cam1" / "c.fits").write_text("3")
+    assert harness.cycle() == [("created", "archived/cam1/c.fits")]
+
+
+def test_directory_removal_deletes_every_file(make_harness, backend):
+    harness = make_harness(backend)
+    nested = harness.root / "night" / "cam1"
+    nested.mkdir(parents=True)
+    (nested / "a.fits").write_text("1")
+    (harness.root / "night" / "b.fits").write_text("2")
+    harness.cycle()
+
+    shutil.rmtree(harness.root / "night")
+    assert harness.cycle() == [("deleted", "night/b.fits"), ("deleted", "night/cam1/a.fits")]
+
+
+def test_files_in_new_nested_directories_are_reported(make_harness, backend):
+    harness = make_harness(backend)
+    nested = harness.root / "a" / "b" / "c"
+    nested.mkdir(parents=True)
+    (nested / "deep.fits").write_text("1")
+    assert harness.cycle() == [("created", "a/b/c/deep.fits")]
+
+
+def test_include_and_exclude_patterns_filter_files(make_harness, backend):
+    harness = make_harness(backend, include_patterns=["*.fits", "*.cr3"], exclude_patterns=["skip_*"])
+    for name in ("keep.fits", "keep.cr3", "notes.txt", "skip_me.fits"):
+        (harness.root / name).write_text("1")
+    assert harness.cycle() == [("created", "keep.cr3"), ("created", "keep.fits")]
+
+
+def test_non_recursive_monitor_ignores_subdirectories(make_harness, backend):
+    harness = make_harness(backend, recursive=False)
+    (harness.root / "sub").mkdir()
+    (harness.root / "sub" / "a.fits").write_text("1")
+    (harness.root / "top.fits").write_text("1")
+    assert harness.cycle() == [("created", "top.fits")]
+
+
+@pytest.mark.parametrize("list_by_fd", [True, False], ids=["dir_fd", "path"])
+def test_walk_scandir_lists_files_with_usable_entries(tmp_path, monkeypatch, list_by_fd):
+    if not list_by_fd:
+        monkeypatch.setattr(os, "supports_fd", os.supports_fd - {os.scandir})
+    elif os.scandir not in os.supports_fd:
+        pytest.skip("os.scandir does not accept a descriptor on this platform")
+    (tmp_path / "night" / "cam1").mkdir(parents=True)
+    (tmp_path / "top.fits").write_text("1")
+    (tmp_path / "night" / "cam1" / "a.fits").write_text("22")
+    (tmp_path / "link.fits").symlink_to(tmp_path / "top.fits")
+    (tmp_path / "linked_dir").symlink_to(tmp_path / "night")
+
+    def walk(**options):
+        # Entries are stat'ed before the walk moves on, as the scan does.
+        return {
+            os.path.relpath(path, tmp_path): entry.stat().st_size
+            for _directory, files in monitor_module._walk_scandir(str(tmp_path), **options)
+            for path, entry in files
+        }
+
+    assert walk(recursive=True) == {"top.fits": 1, "link.fits": 1, os.path.join("night", "cam1", "a.fits"): 2}
+    assert walk(recursive=False) == {"top.fits": 1, "link.fits": 1}
+
+
+def test_backend_selection(tmp_path, monkeypatch):
+    registry = event_action_registry()
+    polling = create_monitor(MonitorConfig(root_path=tmp_path, backend=MonitorBackend.POLLING), registry)
+    assert type(polling) is DirectoryMonitor
+
+    monkeypatch.setattr(monitor_module, "inotify_available", lambda: False)
+    fallback = create_monitor(MonitorConfig(root_path=tmp_path, backend=MonitorBackend.INOTIFY), registry)
+    assert type(fallback) is DirectoryMonitor
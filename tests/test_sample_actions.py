@@ -0,0 +1,224 @@
+"""Tests for the example action callbacks."""
+from __future__ import annotations
+
+import logging
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from prepreproc import sample_actions
+from prepreproc.actions import ActionContext
+from prepreproc.events import EventType, FileEvent
+from prepreproc.snapshot import Snapshot
+
+ROOT = Path("/data")
+
+
+def _event_context(event: FileEvent) -> ActionContext:
+    return ActionContext(root_path=ROOT, snapshot=Snapshot(), event=event)
+
+
+class _RecordingHandler(logging.Handler):
+    """Handler that only counts how often it was flushed."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.flushes = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        pass
+
+    def flush(self) -> None:
+        self.flushes += 1
+
+
+def test_run_shell_command_flushes_log_handlers_before_running(monkeypatch):
+    handler = _RecordingHandler()
+    root_logger = logging.getLogger()
+    root_logger.addHandler(handler)
+    flushes_at_run = []
+    monkeypatch.setattr(subprocess, "run", lambda *args, **kwargs: flushes_at_run.append(handler.flushes))
+    try:
+        context = _event_context(FileEvent(event_type=EventType.CREATED, path=ROOT / "a.fits"))
+        sample_actions.run_shell_command(context, {"command": "echo {filename}"})
+    finally:
+        root_logger.removeHandler(handler)
+
+    assert flushes_at_run == [1]
+
+
+def test_count_suffixes_merges_case_variants_and_labels_missing_extensions():
+    paths = [
+        "/data/a.fits",
+        "/data/b.FITS",
+        "/data/c.Fits",
+        "/data/.hidden",
+        "/data/README",
+        "/data/trailing.",
+        "/data/x.tar.gz",
+    ]
+    counts = sample_actions._count_suffixes(paths)
+    assert counts == {".fits": 3, "<no-ext>": 3, ".gz": 1}
+
+
+def test_lazy_values_compute_placeholders_on_demand():
+    event = FileEvent(event_type=EventType.CREATED, path=ROOT / "night" / "a.fits")
+    values = sample_actions._LazyValues(event, ROOT)
+    assert "{filename} in {directory} under {root}".format_map(values) == "a.fits in /data/night under /data"
+    assert set(values) == {"filename", "directory", "root"}
+    assert values.missing == []
+
+
+def test_lazy_values_record_missing_placeholders_without_raising():
+    event = FileEvent(event_type=EventType.CREATED, path=ROOT / "a.fits")
+    values = sample_actions._LazyValues(event, ROOT)
+    assert "mv {previous_path} {path} {nope}".format_map(values) == "mv  /data/a.fits "
+    assert values.missing == ["previous_path", "nope"]
+
+    # Each mapping has its own list of misses.
+    assert sample_actions._LazyValues(event, ROOT).missing == []
+
+
+def test_lazy_values_supply_previous_placeholders_for_moves():
+    event = FileEvent(event_type=EventType.MOVED, path=ROOT / "b" / "new.fits", previous_path=ROOT / "a" / "old.fits")
+    values = sample_actions._LazyValues(event, ROOT)
+    assert "{previous_directory}/{previous_filename}".format_map(values) == "/data/a/old.fits"
+
+
+def test_static_command_resolves_escapes_and_rejects_placeholders():
+    assert sample_actions._static_command("echo {{literal}}") == "echo {literal}"
+    assert sample_actions._static_command("echo {path}") is None
+
+
+def test_run_shell_command_reports_missing_placeholder(monkeypatch, caplog):
+    monkeypatch.setattr(subprocess, "run", lambda *args, **kwargs: pytest.fail("command should not run"))
+    context = _event_context(FileEvent(event_type=EventType.CREATED, path=ROOT / "a.fits"))
+    with caplog.at_level(logging.ERROR, logger="prepreproc.sample_actions"):
+        sample_actions.run_shell_command(context, {"command": "echo {previous_path}"})
+    assert [record.getMessage() for record in caplog.records] == [
+        "run_shell_command missing placeholder value for 'previous_path'"
+    ]
+
+
+def test_run_shell_command_without_shell_splits_arguments(monkeypatch):
+    calls = []
+    monkeypatch.setattr(subprocess, "run", lambda args, **kwargs: calls.append((args, kwargs["shell"])))
+    context = _event_context(FileEvent(event_type=EventType.CREATED, path=ROOT / "my frame.fits"))
+
+    sample_actions.run_shell_command(context, {"command": "process '{path}' --fast", "shell": False})
+    sample_actions.run_shell_command(context, {"command": "process '{path}' | tee log"})
+
+    assert calls == [
+        (["process", "/data/my frame.fits", "--fast"], False),
+        ("process '/data/my frame.fits' | tee log", True),
+    ]
+
+
+def test_summarize_added_files_counts_new_files_per_directory(caplog):
+    events = [
+        FileEvent(event_type=EventType.CREATED, path=ROOT / "cam1" / "a.fits"),
+        FileEvent(event_type=EventType.CREATED, path=ROOT / "cam1" / "b.fits"),
+        FileEvent(event_type=EventType.CREATED, path=ROOT / "c.fits"),
+        FileEvent(event_type=EventType.MODIFIED, path=ROOT / "cam2" / "d.fits"),
+    ]
+    context = ActionContext(root_path=ROOT, snapshot=Snapshot(), modified_events=events)
+    with caplog.at_level(logging.INFO, logger="prepreproc.sample_actions"):
+        sample_actions.summarize_added_files(context, {})
+    assert [record.getMessage() for record in caplog.records] == [
+        "New files (3 total) for /data -> .: 1, cam1: 2"
+    ]
+
+
+def test_relative_directory_uses_root_prefix():
+    assert sample_actions._relative_directory("/data", ROOT) == "."
+    assert sample_actions._relative_directory("/data/a/b", ROOT) == "a/b"
+    assert sample_actions._relative_directory("/database", ROOT) == "/database"
+    assert sample_actions._relative_directory("/data", Path("/")) == "data"
+
+
+def test_summarize_scan_logs_one_record_with_structured_summary(caplog):
+    snapshot = Snapshot()
+    for path, size in [
+        ("/data/cam1/a.fits", 512 * 1024),
+        ("/data/cam1/b.FITS", 512 * 1024),
+        ("/data/cam2/c.fits", 1024 * 1024),
+        ("/data/notes.txt", 0),
+    ]:
+        snapshot.add(path, 1.0, size)
+    events = [
+        FileEvent(event_type=EventType.CREATED, path=ROOT / "cam1" / "b.FITS"),
+        FileEvent(event_type=EventType.CREATED, path=ROOT / "cam2" / "c.fits"),
+        FileEvent(event_type=EventType.MODIFIED, path=ROOT / "cam1" / "a.fits"),
+    ]
+    context = ActionContext(root_path=ROOT, snapshot=snapshot, modified_events=events)
+    with caplog.at_level(logging.INFO, logger="prepreproc.sample_actions"):
+        sample_actions.summarize_scan(context, {"min_count": 2})
+
+    expected = {
+        "files": 4,
+        "total_mb": 2.0,
+        "changes": 3,
+        "new_files": 2,
+        "extensions": {".fits": 3},
+        "new_dirs": {"cam1": 1, "cam2": 1},
+    }
+    [record] = caplog.records
+    assert record.getMessage() == f"Scan summary for /data: {expected}"
+    assert record.scan_summary == expected
+
+
+def test_summarize_scan_keeps_every_extension_when_none_reach_min_count(caplog):
+    snapshot = Snapshot()
+    snapshot.add("/data/a.fits", 1.0, 1)
+    snapshot.add("/data/b.txt", 1.0, 1)
+    context = ActionContext(root_path=ROOT, snapshot=snapshot)
+    with caplog.at_level(logging.INFO, logger="prepreproc.sample_actions"):
+        sample_actions.summarize_scan(context, {"min_count": 5})
+    [record] = caplog.records
+    assert record.scan_summary["extensions"] == {".fits": 1, ".txt": 1}
+    assert record.scan_summary["new_dirs"] == {}
+
+
+def test_log_event_scheduled_run_reports_snapshot_totals(caplog):
+    snapshot = Snapshot()
+    snapshot.add("/data/a.fits", 1.0, 1024 * 1024)
+    snapshot.add("/data/b.fits", 1.0, 512 * 1024)
+    events = [FileEvent(event_type=EventType.MODIFIED, path=ROOT / "a.fits")]
+    context = ActionContext(root_path=ROOT, snapshot=snapshot, modified_events=events)
+    with caplog.at_level(logging.INFO, logger="prepreproc.sample_actions"):
+        sample_actions.log_event(context, {})
+        sample_actions.log_event(
+            ActionContext(root_path=ROOT, snapshot=Snapshot()), {"schedule_message": "Nightly scan"}
+        )
+    assert [record.getMessage() for record in caplog.records] == [
+        "Scheduled directory scan: 2 files tracked, 1.50 MB total, 1 changes since last run",
+        "Nightly scan: 0 files tracked, 0.00 MB total, 0 changes since last run",
+    ]
+
+
+def test_summarize_directory_counts_extensions_above_min_count(caplog):
+    snapshot = Snapshot()
+    for path in ["/data/a.fits", "/data/cam1/b.FITS", "/data/c.cr3", "/data/README"]:
+        snapshot.add(path, 1.0, 1)
+    context = ActionContext(root_path=ROOT, snapshot=snapshot)
+    with caplog.at_level(logging.INFO, logger="prepreproc.sample_actions"):
+        sample_actions.summarize_directory(context, {})
+        sample_actions.summarize_directory(context, {"min_count": 2})
+        sample_actions.summarize_directory(context, {"min_count": 3})
+        sample_actions.summarize_directory(ActionContext(root_path=ROOT, snapshot=Snapshot()), {})
+    assert [record.getMessage() for record in caplog.records] == [
+        "Directory summary for /data -> .cr3: 1, .fits: 2, <no-ext>: 1",
+        "Directory summary for /data -> .fits: 2",
+        # Nothing reaches min_count, so every extension is listed.
+        "Directory summary for /data -> .cr3: 1, .fits: 2, <no-ext>: 1",
+        "Directory summary for /data -> <empty>",
+    ]
+
+
+def test_summarize_directory_skips_work_when_its_level_is_disabled(caplog, monkeypatch):
+    monkeypatch.setattr(sample_actions, "_count_suffixes", lambda paths: pytest.fail("should not count"))
+    context = ActionContext(root_path=ROOT, snapshot=Snapshot())
+    with caplog.at_level(logging.INFO, logger="prepreproc.sample_actions"):
+        sample_actions.summarize_directory(context, {"level": "DEBUG"})
+    assert caplog.records == []
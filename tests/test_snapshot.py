@@ -0,0 +1,146 @@
+"""Tests for Snapshot storage and snapshot diffing."""
+from __future__ import annotations
+
+from typing import Iterable, List, Tuple
+
+import pytest
+
+from prepreproc import snapshot as snapshot_module
+from prepreproc.snapshot import Snapshot, diff_positions, diff_snapshots
+
+
+def _snapshot(entries: Iterable[Tuple[str, float, int]], generation: int = 0) -> Snapshot:
+    result = Snapshot(generation=generation)
+    for path, mtime, size in entries:
+        result.add(path, mtime, size)
+    return result
+
+
+def _scanned(directories: Iterable[Tuple[str, List[Tuple[str, float, int]]]]) -> Snapshot:
+    """Build a snapshot the way a full scan does, with one digest per directory."""
+
+    result = Snapshot()
+    for directory, files in directories:
+        result.add_directory(
+            directory,
+            [(f"{directory}/{name}", name, mtime, size) for name, mtime, size in files],
+        )
+    return result
+
+
+def _diff(old: Snapshot, new: Snapshot) -> List[Tuple[str, str]]:
+    return sorted((event.event_type.value, str(event.path)) for event in diff_snapshots(old, new))
+
+
+def test_snapshot_behaves_as_a_read_only_mapping():
+    snap = _snapshot([("/d/a", 1.0, 10), ("/d/b", 2.0, 20)])
+    assert len(snap) == 2
+    assert list(snap) == ["/d/a", "/d/b"]
+    assert snap["/d/b"] == (2.0, 20)
+    assert "/d/a" in snap and "/d/c" not in snap
+    assert snap.get("/d/c") is None
+    assert list(snap.entries()) == [("/d/a", 1.0, 10), ("/d/b", 2.0, 20)]
+
+
+def test_set_inserts_or_overwrites():
+    snap = _snapshot([("/d/a", 1.0, 10)])
+    snap.set("/d/a", 5.0, 50)
+    snap.set("/d/b", 2.0, 20)
+    assert dict(snap.items()) == {"/d/a": (5.0, 50), "/d/b": (2.0, 20)}
+
+
+def test_remove_moves_the_last_entry_into_the_freed_slot():
+    snap = _snapshot([("/d/a", 1.0, 10), ("/d/b", 2.0, 20), ("/d/c", 3.0, 30)])
+    snap.remove("/d/a")
+    assert snap.paths == ["/d/c", "/d/b"]
+    assert snap.index == {"/d/c": 0, "/d/b": 1}
+    assert snap["/d/c"] == (3.0, 30)
+    snap.remove("/d/b")  # the last entry: nothing to move
+    assert dict(snap.items()) == {"/d/c": (3.0, 30)}
+
+
+def test_remove_missing_path_raises_key_error():
+    snap = _snapshot([("/d/a", 1.0, 10)])
+    with pytest.raises(KeyError):
+        snap.remove("/d/missing")
+
+
+def test_copy_is_independent_and_keeps_the_generation():
+    original = _snapshot([("/d/a", 1.0, 10)], generation=7)
+    duplicate = original.copy()
+    duplicate.set("/d/b", 2.0, 20)
+    duplicate.set("/d/a", 9.0, 90)
+    assert duplicate.generation == 7
+    assert dict(original.items()) == {"/d/a": (1.0, 10)}
+
+
+def test_total_bytes_is_cached_until_the_snapshot_is_edited():
+    snap = _snapshot([("/d/a", 1.0, 10), ("/d/b", 2.0, 20)])
+    assert snap.total_bytes == 30
+    snap.add("/d/c", 3.0, 5)
+    assert snap.total_bytes == 35
+    snap.set("/d/a", 1.0, 100)
+    assert snap.total_bytes == 125
+    snap.remove("/d/b")
+    assert snap.total_bytes == 105
+
+
+def test_diff_reports_created_modified_and_deleted():
+    old = _snapshot([("/d/same", 1.0, 1), ("/d/touched", 1.0, 1), ("/d/grown", 1.0, 1), ("/d/gone", 1.0, 1)])
+    new = _snapshot([("/d/same", 1.0, 1), ("/d/touched", 2.0, 1), ("/d/grown", 1.0, 2), ("/d/added", 1.0, 1)])
+    assert _diff(old, new) == [
+        ("created", "/d/added"),
+        ("deleted", "/d/gone"),
+        ("modified", "/d/grown"),
+        ("modified", "/d/touched"),
+    ]
+
+
+def test_diff_events_carry_metadata():
+    old = _snapshot([("/d/gone", 1.0, 11)])
+    new = _snapshot([("/d/added", 2.0, 22)])
+    events = {event.event_type.value: event for event in diff_snapshots(old, new)}
+    assert (events["created"].size, events["created"].mtime) == (22, 2.0)
+    assert (events["deleted"].size, events["deleted"].mtime) == (11, 1.0)
+
+
+def test_diff_skips_directories_with_unchanged_digests(monkeypatch):
+    old = _scanned([("/d/quiet", [("a", 1.0, 1), ("b", 1.0, 1)]), ("/d/busy", [("c", 1.0, 1)])])
+    new = _scanned([("/d/quiet", [("a", 1.0, 1), ("b", 1.0, 1)]), ("/d/busy", [("c", 2.0, 1), ("e", 1.0, 1)])])
+
+    compared = []
+    real_diff_positions = snapshot_module.diff_positions
+
+    def recording_diff_positions(old_snap, new_snap, new_range, old_range):
+        compared.append(new_range)
+        return real_diff_positions(old_snap, new_snap, new_range, old_range)
+
+    monkeypatch.setattr(snapshot_module, "diff_positions", recording_diff_positions)
+    assert _diff(old, new) == [("created", "/d/busy/e"), ("modified", "/d/busy/c")]
+    assert compared == [(new.directories["/d/busy"].start, len(new))]
+
+
+def test_diff_handles_new_and_removed_directories():
+    old = _scanned([("/d/kept", [("a", 1.0, 1)]), ("/d/removed", [("b", 1.0, 1)])])
+    new = _scanned([("/d/kept", [("a", 1.0, 1)]), ("/d/added", [("c", 1.0, 1)])])
+    assert _diff(old, new) == [("created", "/d/added/c"), ("deleted", "/d/removed/b")]
+
+
+def test_diff_after_in_place_edits_compares_everything():
+    old = _scanned([("/d", [("a", 1.0, 1), ("b", 1.0, 1)])])
+    new = old.copy()
+    new.set("/d/a", 2.0, 1)  # clears the digests
+    assert not new.directories
+    assert _diff(old, new) == [("modified", "/d/a")]
+
+
+def test_diff_positions_fast_path_for_identical_paths():
+    old = _snapshot([("/d/a", 1.0, 1), ("/d/b", 1.0, 1), ("/d/c", 1.0, 1)])
+    new = _snapshot([("/d/a", 1.0, 1), ("/d/b", 1.0, 9), ("/d/c", 3.0, 1)])
+    assert diff_positions(old, new, (0, 3), (0, 3)) == ([], [1, 2])
+
+
+def test_diff_positions_with_reordered_and_new_paths():
+    old = _snapshot([("/d/a", 1.0, 1), ("/d/b", 1.0, 1)])
+    new = _snapshot([("/d/b", 2.0, 1), ("/d/new", 1.0, 1), ("/d/a", 1.0, 1)])
+    assert diff_positions(old, new, (0, 3), (0, 2)) == ([1], [0])